@@ -59,7 +59,9 @@ from pdf_to_xls.table_extraction import extract_tables_from_text_pdf
 import pandas as pd
 
 pdf_path = 'data.pdf'
-tables, quality_issues = extract_tables_from_text_pdf(pdf_path)
+# The third value holds pre-rendered page images for a Vision retry; it is
+# empty unless render_pages=True is passed
+tables, quality_issues, _page_images = extract_tables_from_text_pdf(pdf_path)
 
 for idx, table_data in enumerate(tables):
     df = table_data['dataframe']
@@ -20,16 +20,23 @@ Main functions:
     - batch_convert_directory: Batch convert multiple PDFs and images
 """
 
-from .converter import convert_pdf_to_excel, batch_convert_directory
+from .converter import (
+    convert_pdf_to_excel,
+    batch_convert_directory,
+    aconvert_pdf_to_excel,
+    abatch_convert_directory,
+)
 from .config import get_api_key, get_model_name
 from .pdf_detection import pdf_has_text, pdf_is_image_based
 from .quality_check import detect_quality_issues
 
-__version__ = '1.0.2'
+__version__ = '1.0.5'
 
 __all__ = [
     'convert_pdf_to_excel',
     'batch_convert_directory',
+    'aconvert_pdf_to_excel',
+    'abatch_convert_directory',
     'get_api_key',
     'get_model_name',
     'pdf_has_text',
@@ -1,15 +1,20 @@
 """Configuration management for PDF to XLS converter."""
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
 def get_api_key():
     """Get Anthropic API key from environment.
 
+    Cached after the first successful lookup, so concurrent batch workers do
+    not repeatedly take the os.environ lock.
+
     Returns:
         str: The API key
 
@@ -26,9 +31,35 @@ def get_api_key():
     return api_key
 
 
+def make_client(api_key=None, use_async=False):
+    """Build an Anthropic client configured for many per-page requests.
+
+    max_retries=5 lets the SDK recover transient 429/529 responses with its
+    own exponential backoff (honoring retry-after) instead of those pages
+    being dropped by the per-page error handlers, and a 120s timeout bounds
+    a hung request to roughly one page's worth of work rather than the
+    SDK's 10-minute default. Each client instance keeps one httpx connection
+    pool, so callers that process many files should share a single client.
+
+    Args:
+        api_key: Optional API key (read from the environment if omitted)
+        use_async: Return an AsyncAnthropic client instead (default: False)
+
+    Returns:
+        anthropic.Anthropic or anthropic.AsyncAnthropic client
+    """
+    import anthropic
+
+    cls = anthropic.AsyncAnthropic if use_async else anthropic.Anthropic
+    return cls(api_key=api_key or get_api_key(), max_retries=5, timeout=120.0)
+
+
+@lru_cache(maxsize=1)
 def get_model_name():
     """Get Claude model name from environment.
 
+    Cached after the first lookup; the model does not change mid-run.
+
     Returns:
         str: The model name (defaults to claude-sonnet-4-5-20250929)
     """
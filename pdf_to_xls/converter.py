@@ -1,30 +1,156 @@
 """Main PDF to Excel conversion functions."""
 
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-import anthropic
 
-from .config import get_api_key, get_model_name
-from .pdf_detection import pdf_is_image_based
-from .table_extraction import extract_table_with_claude_vision, extract_tables_from_text_pdf, extract_table_from_image
+from .config import get_api_key, get_model_name, make_client
+from .logging_utils import logger, setup_queue_logging, setup_worker_logging
+from .image_processing import convert_pdf_page_to_image, convert_image_file_to_base64, open_pdf
+from .pdf_detection import pdf_is_image_based, sniff_kind
+from .table_extraction import (
+    extract_table_with_claude_vision,
+    extract_tables_from_text_pdf,
+    extract_table_from_image,
+    aextract_table_with_claude_vision,
+    aextract_table_from_image,
+    build_vision_request_params,
+    vision_progress_path,
+    _parse_vision_csv,
+)
 from .excel_writer import create_excel_file, merge_continuation_tables
 from .validation import validate_extracted_data
 
 
 # Supported image file extensions
-IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tiff', '.tif'}
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.tiff', '.tif'})
+
+# All extensions batch conversion picks up
+ALL_SUPPORTED_EXTENSIONS = frozenset(IMAGE_EXTENSIONS | {'.pdf'})
+
+# Dot-free variant for the str-based fast path in is_image_file
+_IMAGE_EXT_NODOT = frozenset(ext.lstrip('.') for ext in IMAGE_EXTENSIONS)
+
+
+def _scan_input_files(input_dir, recursive):
+    """Collect all supported input files with a single directory traversal.
+
+    One rglob/iterdir pass replaces separate glob calls per extension, which
+    each restarted the directory walk from the root.
+
+    Args:
+        input_dir: Directory to scan (Path)
+        recursive: Recursively search subdirectories
+
+    Returns:
+        tuple: (all_files, pdf_count, image_count)
+    """
+    # Cheap name checks run first so Zone.Identifier siblings and unsupported
+    # extensions are rejected before the is_file() stat call.
+    entries = input_dir.rglob('*') if recursive else input_dir.iterdir()
+    all_files = [
+        p for p in entries
+        if not p.name.endswith(':Zone.Identifier')
+        and p.suffix.lower() in ALL_SUPPORTED_EXTENSIONS
+        and p.is_file()
+    ]
+    pdf_count = sum(1 for p in all_files if p.suffix.lower() == '.pdf')
+    return all_files, pdf_count, len(all_files) - pdf_count
+
+
+def _mostly_text_pdfs(all_files, sample_size=5):
+    """Probe whether a batch is dominated by text-based PDFs.
+
+    Samples the first few PDF files (magic sniff plus the cached
+    pdf_is_image_based check) to decide whether process-based parallelism
+    is worth the fork overhead.
+
+    Args:
+        all_files: List of input file paths
+        sample_size: Maximum number of PDFs to probe (default: 5)
+
+    Returns:
+        bool: True if more than half the sampled PDFs are text-based
+    """
+    sample = [p for p in all_files if not _input_is_image(p)][:sample_size]
+    if not sample:
+        return False
+    text_count = sum(1 for p in sample if not pdf_is_image_based(p))
+    return text_count * 2 > len(sample)
 
 
 def is_image_file(file_path):
     """Check if file is a supported image format.
 
+    Works on the raw path string so the hot per-file scan loop avoids a
+    Path allocation per call.
+
     Args:
         file_path: Path to file (str or Path)
 
     Returns:
         bool: True if file has a supported image extension
     """
-    file_path = Path(file_path)
-    return file_path.suffix.lower() in IMAGE_EXTENSIONS
+    # Mirror Path.suffix semantics: no dot (or only a leading dot, as in a
+    # hidden file) means no extension, so a file literally named "jpg" or
+    # ".png" is not an image
+    name = os.path.basename(os.fspath(file_path))
+    dot = name.rfind('.')
+    return dot > 0 and name[dot + 1:].lower() in _IMAGE_EXT_NODOT
+
+
+def _input_is_image(file_path):
+    """Decide whether a file should take the image path rather than the PDF path.
+
+    Sniffs magic bytes first (one 16-byte read), falling back to the file
+    extension only when the magic is inconclusive. This classifies most files
+    without opening them with pdfplumber/PyMuPDF.
+
+    Args:
+        file_path: Path to file (str or Path)
+
+    Returns:
+        bool: True if the file should be treated as an image
+    """
+    kind = sniff_kind(file_path)
+    if kind == 'pdf':
+        return False
+    if kind in ('jpg', 'png', 'tiff'):
+        return True
+    return is_image_file(file_path)
+
+
+def _done_marker_path(output_path):
+    """Return the sidecar marker path recording a completed conversion."""
+    return output_path.parent / f"{output_path.stem}.pdf2xls.done"
+
+
+def _output_is_current(pdf_path, output_path):
+    """Check whether a conversion output is already up to date.
+
+    True when the Excel file - or the .pdf2xls.done sidecar marker left for
+    cases where the workbook was moved away - exists and is at least as new
+    as the source file.
+
+    Args:
+        pdf_path: Path to the source PDF or image file
+        output_path: Path where the Excel output would be written
+
+    Returns:
+        bool: True if conversion can be skipped
+    """
+    try:
+        source_mtime = pdf_path.stat().st_mtime_ns
+        for candidate in (output_path, _done_marker_path(output_path)):
+            if candidate.exists() and candidate.stat().st_mtime_ns >= source_mtime:
+                return True
+    except OSError:
+        pass
+    return False
 
 
 def convert_pdf_to_excel(
@@ -34,7 +160,10 @@ def convert_pdf_to_excel(
     save_every=10,
     force_vision=False,
     api_key=None,
-    model_name=None
+    model_name=None,
+    client=None,
+    prerender_for_retry=False,
+    skip_if_newer=True
 ):
     """Convert PDF or image file to Excel file.
 
@@ -49,6 +178,15 @@ def convert_pdf_to_excel(
         force_vision: Force Vision API extraction even for text-based PDFs (default: False)
         api_key: Optional Anthropic API key (uses env var if not provided)
         model_name: Optional Claude model name (uses env var if not provided)
+        client: Optional anthropic.Anthropic client to reuse; batch runs pass
+            one shared client so every file reuses its HTTP connection pool
+        prerender_for_retry: Render page images during the text-extraction
+            pass so a Vision retry skips re-rasterizing the PDF (default:
+            False; costs time/memory up front that is wasted if no retry
+            happens)
+        skip_if_newer: Skip conversion when the output (or its .pdf2xls.done
+            marker) already exists and is newer than the input (default:
+            True); makes re-runs over partially converted directories cheap
 
     Returns:
         Path: Path to the created Excel file, or None if no tables found
@@ -57,6 +195,7 @@ def convert_pdf_to_excel(
         FileNotFoundError: If file does not exist
         ValueError: If API key is required but not found
     """
+    setup_queue_logging()
     pdf_path = Path(pdf_path)
 
     if not pdf_path.exists():
@@ -72,23 +211,30 @@ def convert_pdf_to_excel(
             output_dir = pdf_path.parent
         output_path = output_dir / f"{pdf_path.stem}.xlsx"
 
-    print(f"Converting: {pdf_path}")
-    print(f"Output: {output_path}")
+    if skip_if_newer and _output_is_current(pdf_path, output_path):
+        logger.info(f"Skipping {pdf_path}: output is up to date")
+        return output_path
+
+    logger.info(f"Converting: {pdf_path}")
+    logger.info(f"Output: {output_path}")
+
+    # Resolve configuration once, before any branch (lookups are cached)
+    model_name = model_name or get_model_name()
+
+    def _get_client():
+        nonlocal client
+        if client is None:
+            client = make_client(api_key)
+        return client
 
     try:
-        # Check if input is an image file
-        if is_image_file(pdf_path):
+        # Check if input is an image file (magic bytes first, extension fallback)
+        input_is_image = _input_is_image(pdf_path)
+        if input_is_image:
             # Image file: use Vision API directly
-            print("  Image file detected, using Vision API...")
+            logger.info("  Image file detected, using Vision API...")
 
-            # Get API configuration
-            if not api_key:
-                api_key = get_api_key()
-            if not model_name:
-                model_name = get_model_name()
-
-            client = anthropic.Anthropic(api_key=api_key)
-            tables = extract_table_from_image(pdf_path, client, model_name)
+            tables = extract_table_from_image(pdf_path, _get_client(), model_name)
         else:
             # PDF file: check if it's image-based or text-based
             is_image_based = pdf_is_image_based(pdf_path)
@@ -96,91 +242,337 @@ def convert_pdf_to_excel(
             if force_vision or is_image_based:
                 # Image-based PDF or forced Vision API: use Vision API with rotation detection
                 if force_vision and not is_image_based:
-                    print("  Text-based PDF, using Vision API (forced)...")
+                    logger.info("  Text-based PDF, using Vision API (forced)...")
                 else:
-                    print("  Image-based PDF detected, using Vision API with rotation detection...")
-
-                # Get API configuration
-                if not api_key:
-                    api_key = get_api_key()
-                if not model_name:
-                    model_name = get_model_name()
-
-                client = anthropic.Anthropic(api_key=api_key)
-                tables = extract_table_with_claude_vision(pdf_path, client, model_name, output_path, save_every)
+                    logger.info("  Image-based PDF detected, using Vision API with rotation detection...")
+
+                # Hybrid documents can still carry clean text pages; let
+                # pdfplumber serve those unless Vision was explicitly forced
+                tables = extract_table_with_claude_vision(
+                    pdf_path, _get_client(), model_name, output_path, save_every,
+                    text_fast_path=not force_vision
+                )
             else:
                 # Text-based PDF: use direct extraction (fast, no API needed)
-                print("  Text-based PDF, using direct extraction...")
-                tables, quality_issues_detected = extract_tables_from_text_pdf(pdf_path)
+                logger.info("  Text-based PDF, using direct extraction...")
+                tables, quality_issues_detected, page_images = extract_tables_from_text_pdf(
+                    pdf_path, render_pages=prerender_for_retry
+                )
 
                 # Auto-retry with Vision API if quality issues detected OR no tables found
                 if quality_issues_detected or not tables:
                     if quality_issues_detected:
-                        print("\n  ⚠️  Quality issues detected in text extraction!")
-                        print("  🔄 Retrying with Vision API for better accuracy...\n")
+                        logger.info("\n  ⚠️  Quality issues detected in text extraction!")
+                        logger.info("  🔄 Retrying with Vision API for better accuracy...\n")
                     else:
-                        print("\n  ⚠️  No tables found with text extraction!")
-                        print("  🔄 Retrying with Vision API...\n")
+                        logger.info("\n  ⚠️  No tables found with text extraction!")
+                        logger.info("  🔄 Retrying with Vision API...\n")
 
-                    # Get API configuration
-                    if not api_key:
-                        api_key = get_api_key()
-                    if not model_name:
-                        model_name = get_model_name()
-
-                    client = anthropic.Anthropic(api_key=api_key)
-                    tables = extract_table_with_claude_vision(pdf_path, client, model_name, output_path, save_every)
+                    # Pages whose text tables were clean are re-served by
+                    # pdfplumber; only the flagged pages pay for Vision
+                    tables = extract_table_with_claude_vision(
+                        pdf_path, _get_client(), model_name, output_path, save_every,
+                        precomputed_images=page_images or None,
+                        text_fast_path=True
+                    )
 
         if not tables:
-            print(f"Warning: No tables found in {pdf_path}")
+            logger.info(f"Warning: No tables found in {pdf_path}")
             return None
 
         # Merge continuation tables (tables that span multiple pages)
         tables = merge_continuation_tables(tables)
 
         # Validate extracted data (only for PDF files, not images)
-        if not is_image_file(pdf_path):
-            print("\nValidating extracted data...")
+        if not input_is_image:
+            logger.info("\nValidating extracted data...")
             validation_report_path = output_path.parent / f"{output_path.stem}_validation.md"
             validation_result = validate_extracted_data(pdf_path, tables, validation_report_path)
 
             if validation_result['status'] == 'completed':
                 accuracy = validation_result['statistics']['accuracy_percent']
                 if accuracy >= 95:
-                    print(f"  ✓ Validation complete: {accuracy:.2f}% accuracy")
+                    logger.info(f"  ✓ Validation complete: {accuracy:.2f}% accuracy")
                 else:
-                    print(f"  ⚠️  Validation complete: {accuracy:.2f}% accuracy - please review report")
+                    logger.info(f"  ⚠️  Validation complete: {accuracy:.2f}% accuracy - please review report")
 
                 discrepancies = validation_result['discrepancies']
                 if discrepancies['missing_in_tables'] or discrepancies['extra_in_tables']:
-                    print(f"  ⚠️  Found discrepancies - see validation report for details")
+                    logger.info(f"  ⚠️  Found discrepancies - see validation report for details")
             elif validation_result['status'] == 'skipped':
                 # Message already printed by validate_extracted_data()
                 pass
 
         # Create Excel file
-        return create_excel_file(tables, output_path)
+        result = create_excel_file(tables, output_path)
+
+        # Conversion finished - drop any Vision checkpoint left by this run
+        progress_path = vision_progress_path(output_path)
+        if progress_path.exists():
+            progress_path.unlink()
+
+        return result
 
     except Exception as e:
-        print(f"Error converting {pdf_path}: {e}")
+        logger.info(f"Error converting {pdf_path}: {e}")
         import traceback
         traceback.print_exc()
         raise
 
 
+def _batch_convert_pipelined(all_files, out_dirs, force_vision, api_key, model_name):
+    """Run a batch through a 3-stage detect -> extract -> write pipeline.
+
+    Each stage runs in its own thread connected by bounded queues, so PDF
+    rendering/type probing and workbook writing overlap with in-flight Vision
+    API calls instead of stalling on them. Bounded queues (maxsize=8) provide
+    backpressure; a None sentinel shuts each stage down.
+
+    Args:
+        all_files: List of input file paths to convert
+        out_dirs: Dict mapping each file path to its (pre-created) output dir
+        force_vision: Force Vision API extraction for all PDFs
+        api_key: Optional Anthropic API key (uses env var if not provided)
+        model_name: Optional Claude model name (uses env var if not provided)
+
+    Returns:
+        tuple: (success_list, failed_list) of file paths
+    """
+    extract_q = queue.Queue(maxsize=8)
+    write_q = queue.Queue(maxsize=8)
+
+    success_list = []
+    failed_list = []
+
+    def detect_worker():
+        for file_path in all_files:
+            try:
+                if _input_is_image(file_path):
+                    mode = 'image'
+                elif force_vision or pdf_is_image_based(file_path):
+                    mode = 'vision'
+                else:
+                    mode = 'text'
+                extract_q.put((file_path, mode))
+            except Exception as e:
+                logger.info(f"Failed to detect type of {file_path}: {e}")
+                failed_list.append(file_path)
+        extract_q.put(None)
+
+    def extract_worker():
+        client = None
+        while True:
+            item = extract_q.get()
+            if item is None:
+                break
+            file_path, mode = item
+
+            try:
+                output_path = out_dirs[file_path] / f"{file_path.stem}.xlsx"
+                logger.info(f"Converting: {file_path}")
+
+                if mode == 'text':
+                    logger.info("  Text-based PDF, using direct extraction...")
+                    tables, quality_issues_detected, _ = extract_tables_from_text_pdf(file_path)
+                    if quality_issues_detected or not tables:
+                        mode = 'vision'
+
+                if mode in ('image', 'vision'):
+                    if client is None:
+                        client = make_client(api_key)
+                    resolved_model = model_name or get_model_name()
+                    if mode == 'image':
+                        logger.info("  Image file detected, using Vision API...")
+                        tables = extract_table_from_image(file_path, client, resolved_model)
+                    else:
+                        logger.info("  Using Vision API with rotation detection...")
+                        tables = extract_table_with_claude_vision(
+                            file_path, client, resolved_model, output_path
+                        )
+
+                write_q.put((file_path, tables, output_path))
+            except Exception as e:
+                logger.info(f"Failed to convert {file_path}: {e}")
+                failed_list.append(file_path)
+        write_q.put(None)
+
+    def write_worker():
+        while True:
+            item = write_q.get()
+            if item is None:
+                break
+            file_path, tables, output_path = item
+
+            try:
+                if not tables:
+                    logger.info(f"Warning: No tables found in {file_path}")
+                    continue
+                tables = merge_continuation_tables(tables)
+                create_excel_file(tables, output_path)
+                success_list.append(file_path)
+            except Exception as e:
+                logger.info(f"Failed to write {file_path}: {e}")
+                failed_list.append(file_path)
+
+    threads = [
+        threading.Thread(target=detect_worker, name='detect'),
+        threading.Thread(target=extract_worker, name='extract'),
+        threading.Thread(target=write_worker, name='write'),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return success_list, failed_list
+
+
+def _batch_convert_message_batches(all_files, out_dirs, force_vision, api_key, model_name,
+                                   max_batch=1000, poll_interval=15):
+    """Convert a batch by aggregating Vision calls into Message Batches.
+
+    All page images that need Vision extraction are submitted together via
+    the Anthropic Message Batches API (50% cheaper and much higher
+    throughput than per-page synchronous calls, at the cost of latency).
+    Text-based PDFs are still converted inline without touching the API.
+
+    Args:
+        all_files: List of input file paths to convert
+        out_dirs: Dict mapping each file path to its (pre-created) output dir
+        force_vision: Force Vision API extraction for all PDFs
+        api_key: Optional Anthropic API key (uses env var if not provided)
+        model_name: Optional Claude model name (uses env var if not provided)
+        max_batch: Maximum requests per submitted batch (default: 1000)
+        poll_interval: Seconds between batch status polls (default: 15)
+
+    Returns:
+        tuple: (success_list, failed_list) of file paths
+    """
+    client = make_client(api_key)
+    model = model_name or get_model_name()
+
+    success_list = []
+    failed_list = []
+
+    # custom_id -> (file_path, page_num); ids are index-based to stay short
+    id_map = {}
+    requests = []
+    # file_path -> {page_num: dataframe} for Vision results
+    vision_results = {}
+
+    def _finish_file(file_path, tables):
+        output_path = out_dirs[file_path] / f"{file_path.stem}.xlsx"
+        if not tables:
+            logger.info(f"Warning: No tables found in {file_path}")
+            return
+        tables = merge_continuation_tables(tables)
+        create_excel_file(tables, output_path)
+        success_list.append(file_path)
+
+    # Stage 1: classify files, convert text PDFs inline, render Vision pages
+    for file_idx, file_path in enumerate(all_files):
+        try:
+            if _input_is_image(file_path):
+                image_data = convert_image_file_to_base64(file_path)
+                page_images = {1: image_data} if image_data else {}
+            elif force_vision or pdf_is_image_based(file_path):
+                with open_pdf(file_path) as doc:
+                    page_images = {
+                        page_num: convert_pdf_page_to_image(doc, page_num)
+                        for page_num in range(1, len(doc) + 1)
+                    }
+            else:
+                logger.info(f"Converting: {file_path}")
+                logger.info("  Text-based PDF, using direct extraction...")
+                tables, quality_issues_detected, _ = extract_tables_from_text_pdf(file_path)
+                if not quality_issues_detected and tables:
+                    _finish_file(file_path, tables)
+                    continue
+                # Quality retry goes through the batch like image-based PDFs
+                with open_pdf(file_path) as doc:
+                    page_images = {
+                        page_num: convert_pdf_page_to_image(doc, page_num)
+                        for page_num in range(1, len(doc) + 1)
+                    }
+
+            vision_results[file_path] = {}
+            for page_num, image_data in page_images.items():
+                if not image_data:
+                    logger.info(f"    Could not convert page {page_num} of {file_path} to image")
+                    continue
+                custom_id = f"f{file_idx}_p{page_num}"
+                id_map[custom_id] = (file_path, page_num)
+                requests.append({
+                    "custom_id": custom_id,
+                    "params": build_vision_request_params(image_data, model),
+                })
+        except Exception as e:
+            logger.info(f"Failed to prepare {file_path}: {e}")
+            failed_list.append(file_path)
+
+    # Stage 2: submit batches and poll until they end
+    for chunk_start in range(0, len(requests), max_batch):
+        chunk = requests[chunk_start:chunk_start + max_batch]
+        logger.info(f"Submitting message batch with {len(chunk)} request(s)...")
+        batch = client.messages.batches.create(requests=chunk)
+
+        while batch.processing_status != 'ended':
+            time.sleep(poll_interval)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        for entry in client.messages.batches.results(batch.id):
+            file_path, page_num = id_map[entry.custom_id]
+            if entry.result.type != 'succeeded':
+                logger.info(f"    Batch request failed for {file_path} page {page_num}: {entry.result.type}")
+                continue
+            response_text = entry.result.message.content[0].text
+            df = _parse_vision_csv(response_text, f"{file_path.name} page {page_num}")
+            if df is not None:
+                vision_results[file_path][page_num] = df
+
+    # Stage 3: assemble per-file tables and write workbooks
+    for file_path, pages in vision_results.items():
+        try:
+            if not pages:
+                # Every page request errored or parsed to nothing; count the
+                # file as failed so the accounting matches the other modes
+                logger.info(f"Failed to convert {file_path}: no pages extracted")
+                failed_list.append(file_path)
+                continue
+            tables = [
+                {'dataframe': pages[page_num], 'page': page_num, 'table': 1}
+                for page_num in sorted(pages)
+            ]
+            _finish_file(file_path, tables)
+        except Exception as e:
+            logger.info(f"Failed to write {file_path}: {e}")
+            failed_list.append(file_path)
+
+    return success_list, failed_list
+
+
 def batch_convert_directory(
     input_dir,
     output_dir=None,
     recursive=False,
     force_vision=False,
     api_key=None,
-    model_name=None
+    model_name=None,
+    max_workers=4,
+    continue_on_error=True,
+    pipeline=False,
+    executor='auto',
+    batch_mode=False
 ):
     """Batch convert PDFs and image files in directory.
 
     Auto-detects text vs image-based PDFs. Processes all supported image formats
     (.jpg, .jpeg, .png, .tiff, .tif) using Vision API.
 
+    Files are converted concurrently with a thread pool. The dominant cost per
+    file is the network-bound Vision API call (plus file I/O that releases the
+    GIL), so threads give near-linear speedup up to the API rate limit.
+
     Args:
         input_dir: Directory containing PDF and/or image files (str or Path)
         output_dir: Optional output directory (str or Path)
@@ -188,6 +580,20 @@ def batch_convert_directory(
         force_vision: Force Vision API extraction for all PDFs (default: False)
         api_key: Optional Anthropic API key (uses env var if not provided)
         model_name: Optional Claude model name (uses env var if not provided)
+        max_workers: Number of files to convert concurrently (default: 4)
+        continue_on_error: Keep converting remaining files when one fails
+            (default: True); if False, the first failure is re-raised
+        pipeline: Run the batch through a staged detect/extract/write
+            pipeline instead of the per-file thread pool (default: False);
+            useful when files are large and stages should overlap
+        executor: 'thread', 'process', or 'auto' (default). Threads suit
+            network-bound Vision batches; processes sidestep the GIL for
+            CPU-bound text-PDF extraction. 'auto' samples the first few
+            files and picks processes when most are text-based.
+        batch_mode: Aggregate all Vision calls into the Anthropic Message
+            Batches API (default: False). Halves API cost and raises
+            throughput on large runs, but individual files finish with
+            higher latency.
 
     Returns:
         dict: Dictionary with 'success' and 'failed' lists of file paths
@@ -195,71 +601,371 @@ def batch_convert_directory(
     Raises:
         FileNotFoundError: If input directory does not exist
     """
+    setup_queue_logging()
     input_dir = Path(input_dir)
 
     if not input_dir.exists():
         raise FileNotFoundError(f"Directory not found: {input_dir}")
 
-    # Find all PDF files
-    if recursive:
-        pdf_files = list(input_dir.rglob("*.pdf"))
-    else:
-        pdf_files = list(input_dir.glob("*.pdf"))
-
-    # Find all image files
-    image_files = []
-    for ext in IMAGE_EXTENSIONS:
-        if recursive:
-            image_files.extend(input_dir.rglob(f"*{ext}"))
-        else:
-            image_files.extend(input_dir.glob(f"*{ext}"))
-
-    # Combine all files
-    all_files = pdf_files + image_files
-
-    # Filter out zone identifier files
-    all_files = [f for f in all_files if ':Zone.Identifier' not in str(f)]
+    # Find all supported files in one traversal
+    all_files, pdf_count, image_count = _scan_input_files(input_dir, recursive)
 
     if not all_files:
-        print(f"No PDF or image files found in {input_dir}")
+        logger.info(f"No PDF or image files found in {input_dir}")
         return {'success': [], 'failed': []}
 
-    print(f"Found {len(all_files)} file(s) ({len(pdf_files)} PDF, {len(image_files)} image)")
-    print("=" * 70)
+    logger.info(f"Found {len(all_files)} file(s) ({pdf_count} PDF, {image_count} image)")
+    logger.info("=" * 70)
+
+    # Fail fast on a missing API key: when the batch will clearly need the
+    # Vision API (forced, or any image file by magic sniff), raise once here
+    # instead of N per-file failures after paying the detection cost.
+    if force_vision or any(_input_is_image(p) for p in all_files):
+        api_key = api_key or get_api_key()
+        model_name = model_name or get_model_name()
 
     success_list = []
     failed_list = []
 
+    # Precompute each file's output directory (and create it) up front so the
+    # worker threads never race on mkdir. Entries must be created Paths: the
+    # pipeline and batch modes join output filenames onto them directly.
+    out_dirs = {}
     for file_path in all_files:
+        if output_dir and recursive:
+            rel_path = file_path.relative_to(input_dir)
+            out_dir = Path(output_dir) / rel_path.parent
+            out_dir.mkdir(parents=True, exist_ok=True)
+        elif output_dir:
+            out_dir = Path(output_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            out_dir = file_path.parent
+        out_dirs[file_path] = out_dir
+
+    if batch_mode:
+        success_list, failed_list = _batch_convert_message_batches(
+            all_files, out_dirs, force_vision, api_key, model_name
+        )
+        logger.info(f"\n✓ Conversion complete!")
+        logger.info(f"  Successful: {len(success_list)}/{len(all_files)}")
+
+        if failed_list:
+            logger.info(f"\n✗ Failed files ({len(failed_list)}):")
+            for f in failed_list:
+                logger.info(f"  - {f}")
+
+        return {'success': success_list, 'failed': failed_list}
+
+    if pipeline:
+        success_list, failed_list = _batch_convert_pipelined(
+            all_files, out_dirs, force_vision, api_key, model_name
+        )
+        logger.info(f"\n✓ Conversion complete!")
+        logger.info(f"  Successful: {len(success_list)}/{len(all_files)}")
+
+        if failed_list:
+            logger.info(f"\n✗ Failed files ({len(failed_list)}):")
+            for f in failed_list:
+                logger.info(f"  - {f}")
+
+        return {'success': success_list, 'failed': failed_list}
+
+    if executor == 'auto':
+        # pdfplumber extraction is CPU-bound and GIL-limited, so text-heavy
+        # batches scale with processes; Vision-bound batches want threads.
+        executor = 'process' if (not force_vision and _mostly_text_pdfs(all_files)) else 'thread'
+
+    if executor == 'process':
+        # Forked workers inherit the parent's queue handler without its
+        # listener thread; the initializer swaps in a direct stream handler
+        # so per-file diagnostics still appear
+        pool = ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(all_files)),
+            initializer=setup_worker_logging,
+        )
+        # Clients hold sockets and are not picklable; workers build their own
+        shared_client = None
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Build one client for the whole batch so all workers share its HTTP
+        # connection pool (no TLS handshake per file). Text-only batches may
+        # have no API key configured; they still convert without one.
         try:
-            if output_dir and recursive:
-                rel_path = file_path.relative_to(input_dir)
-                out_dir = Path(output_dir) / rel_path.parent
+            shared_client = make_client(api_key)
+        except ValueError:
+            shared_client = None
+
+    with pool as worker_pool:
+        futures = {
+            worker_pool.submit(
+                convert_pdf_to_excel,
+                file_path,
+                output_dir=out_dirs[file_path],
+                force_vision=force_vision,
+                api_key=api_key,
+                model_name=model_name,
+                client=shared_client
+            ): file_path
+            for file_path in all_files
+        }
+
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                result = future.result()
+                if result:
+                    success_list.append(file_path)
+                logger.info("=" * 70)
+            except Exception as e:
+                logger.info(f"Failed to convert {file_path}: {e}")
+                failed_list.append(file_path)
+                logger.info("=" * 70)
+                if not continue_on_error:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
+    logger.info(f"\n✓ Conversion complete!")
+    logger.info(f"  Successful: {len(success_list)}/{len(all_files)}")
+
+    if failed_list:
+        logger.info(f"\n✗ Failed files ({len(failed_list)}):")
+        for f in failed_list:
+            logger.info(f"  - {f}")
+
+    return {'success': success_list, 'failed': failed_list}
+
+async def aconvert_pdf_to_excel(
+    pdf_path,
+    output_path=None,
+    output_dir=None,
+    force_vision=False,
+    api_key=None,
+    model_name=None,
+    client=None,
+    semaphore=None,
+    skip_if_newer=True
+):
+    """Async variant of convert_pdf_to_excel.
+
+    Vision API calls are awaited on an anthropic.AsyncAnthropic client, so a
+    single event loop can keep many requests in flight; blocking CPU work
+    (text extraction, Excel writing) is pushed to worker threads with
+    asyncio.to_thread.
+
+    Args:
+        pdf_path: Path to PDF or image file (str or Path)
+        output_path: Optional output Excel file path (str or Path)
+        output_dir: Optional output directory (str or Path)
+        force_vision: Force Vision API extraction even for text-based PDFs (default: False)
+        api_key: Optional Anthropic API key (uses env var if not provided)
+        model_name: Optional Claude model name (uses env var if not provided)
+        client: Optional anthropic.AsyncAnthropic client to reuse across files
+        semaphore: Optional asyncio.Semaphore limiting in-flight API calls
+        skip_if_newer: Skip conversion when the output (or its .pdf2xls.done
+            marker) already exists and is newer than the input (default: True)
+
+    Returns:
+        Path: Path to the created Excel file, or None if no tables found
+
+    Raises:
+        FileNotFoundError: If file does not exist
+        ValueError: If API key is required but not found
+    """
+    setup_queue_logging()
+    pdf_path = Path(pdf_path)
+
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"File not found: {pdf_path}")
+
+    if output_path:
+        output_path = Path(output_path)
+    else:
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            output_dir = pdf_path.parent
+        output_path = output_dir / f"{pdf_path.stem}.xlsx"
+
+    if skip_if_newer and _output_is_current(pdf_path, output_path):
+        logger.info(f"Skipping {pdf_path}: output is up to date")
+        return output_path
+
+    logger.info(f"Converting: {pdf_path}")
+    logger.info(f"Output: {output_path}")
+
+    # Resolve configuration once, before any branch (lookups are cached)
+    model_name = model_name or get_model_name()
+
+    def _get_client():
+        nonlocal client
+        if client is None:
+            client = make_client(api_key, use_async=True)
+        return client
+
+    try:
+        input_is_image = _input_is_image(pdf_path)
+        if input_is_image:
+            logger.info("  Image file detected, using Vision API...")
+            tables = await aextract_table_from_image(
+                pdf_path, _get_client(), model_name, semaphore
+            )
+        else:
+            is_image_based = await asyncio.to_thread(pdf_is_image_based, pdf_path)
+
+            if force_vision or is_image_based:
+                if force_vision and not is_image_based:
+                    logger.info("  Text-based PDF, using Vision API (forced)...")
+                else:
+                    logger.info("  Image-based PDF detected, using Vision API with rotation detection...")
+
+                tables = await aextract_table_with_claude_vision(
+                    pdf_path, _get_client(), model_name, semaphore
+                )
             else:
-                out_dir = output_dir or file_path.parent
+                logger.info("  Text-based PDF, using direct extraction...")
+                tables, quality_issues_detected, _ = await asyncio.to_thread(
+                    extract_tables_from_text_pdf, pdf_path
+                )
+
+                # Auto-retry with Vision API if quality issues detected OR no tables found
+                if quality_issues_detected or not tables:
+                    if quality_issues_detected:
+                        logger.info("\n  ⚠️  Quality issues detected in text extraction!")
+                        logger.info("  🔄 Retrying with Vision API for better accuracy...\n")
+                    else:
+                        logger.info("\n  ⚠️  No tables found with text extraction!")
+                        logger.info("  🔄 Retrying with Vision API...\n")
+
+                    tables = await aextract_table_with_claude_vision(
+                        pdf_path, _get_client(), model_name, semaphore
+                    )
+
+        if not tables:
+            logger.info(f"Warning: No tables found in {pdf_path}")
+            return None
 
-            result = convert_pdf_to_excel(
+        # Merge continuation tables (tables that span multiple pages)
+        tables = merge_continuation_tables(tables)
+
+        # Validate extracted data (only for PDF files, not images)
+        if not input_is_image:
+            logger.info("\nValidating extracted data...")
+            validation_report_path = output_path.parent / f"{output_path.stem}_validation.md"
+            await asyncio.to_thread(
+                validate_extracted_data, pdf_path, tables, validation_report_path
+            )
+
+        # Create Excel file
+        return await asyncio.to_thread(create_excel_file, tables, output_path)
+
+    except Exception as e:
+        logger.info(f"Error converting {pdf_path}: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+
+async def abatch_convert_directory(
+    input_dir,
+    output_dir=None,
+    recursive=False,
+    force_vision=False,
+    api_key=None,
+    model_name=None,
+    max_in_flight=8
+):
+    """Async variant of batch_convert_directory.
+
+    Drives all files concurrently with asyncio.gather on one AsyncAnthropic
+    client; an asyncio.Semaphore caps in-flight Vision API requests so
+    concurrency scales to the API rate limit rather than a thread count.
+
+    Args:
+        input_dir: Directory containing PDF and/or image files (str or Path)
+        output_dir: Optional output directory (str or Path)
+        recursive: Recursively search subdirectories (default: False)
+        force_vision: Force Vision API extraction for all PDFs (default: False)
+        api_key: Optional Anthropic API key (uses env var if not provided)
+        model_name: Optional Claude model name (uses env var if not provided)
+        max_in_flight: Maximum concurrent Vision API requests (default: 8)
+
+    Returns:
+        dict: Dictionary with 'success' and 'failed' lists of file paths
+
+    Raises:
+        FileNotFoundError: If input directory does not exist
+    """
+    setup_queue_logging()
+    input_dir = Path(input_dir)
+
+    if not input_dir.exists():
+        raise FileNotFoundError(f"Directory not found: {input_dir}")
+
+    # Find all supported files in one traversal
+    all_files, pdf_count, image_count = _scan_input_files(input_dir, recursive)
+
+    if not all_files:
+        logger.info(f"No PDF or image files found in {input_dir}")
+        return {'success': [], 'failed': []}
+
+    logger.info(f"Found {len(all_files)} file(s) ({pdf_count} PDF, {image_count} image)")
+    logger.info("=" * 70)
+
+    # Precompute output directories before launching tasks to avoid mkdir races
+    out_dirs = {}
+    for file_path in all_files:
+        if output_dir and recursive:
+            rel_path = file_path.relative_to(input_dir)
+            out_dir = Path(output_dir) / rel_path.parent
+            out_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            out_dir = output_dir or file_path.parent
+        out_dirs[file_path] = out_dir
+
+    # Build one client for the whole batch so all tasks share its HTTP
+    # connection pool. Text-only batches may have no API key configured;
+    # they still convert without one, and aconvert_pdf_to_excel builds its
+    # own client lazily should a file turn out to need Vision after all.
+    try:
+        client = make_client(api_key, use_async=True)
+    except ValueError:
+        client = None
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    results = await asyncio.gather(
+        *(
+            aconvert_pdf_to_excel(
                 file_path,
-                output_dir=out_dir,
+                output_dir=out_dirs[file_path],
                 force_vision=force_vision,
                 api_key=api_key,
-                model_name=model_name
+                model_name=model_name,
+                client=client,
+                semaphore=semaphore
             )
-            if result:
-                success_list.append(file_path)
-            print("=" * 70)
+            for file_path in all_files
+        ),
+        return_exceptions=True
+    )
 
-        except Exception as e:
-            print(f"Failed to convert {file_path}: {e}")
+    success_list = []
+    failed_list = []
+    for file_path, result in zip(all_files, results):
+        if isinstance(result, BaseException):
+            logger.info(f"Failed to convert {file_path}: {result}")
             failed_list.append(file_path)
-            print("=" * 70)
+        elif result:
+            success_list.append(file_path)
 
-    print(f"\n✓ Conversion complete!")
-    print(f"  Successful: {len(success_list)}/{len(all_files)}")
+    logger.info(f"\n✓ Conversion complete!")
+    logger.info(f"  Successful: {len(success_list)}/{len(all_files)}")
 
     if failed_list:
-        print(f"\n✗ Failed files ({len(failed_list)}):")
+        logger.info(f"\n✗ Failed files ({len(failed_list)}):")
         for f in failed_list:
-            print(f"  - {f}")
+            logger.info(f"  - {f}")
 
     return {'success': success_list, 'failed': failed_list}
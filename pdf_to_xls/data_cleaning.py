@@ -4,58 +4,159 @@ import re
 import pandas as pd
 
 
-def _fix_cell_parens(value):
-    """Fix common parenthesis issues in a single cell.
+# All regex patterns are compiled once at import time so the hot cleaning
+# loops never pay the re-cache lookup per call.
+# Cell-level patterns (clean_malformed_parentheses):
+_RE_LPAR_SPACE = re.compile(r'\(\s+')
+_RE_SPACE_RPAR = re.compile(r'\s+\)')
+_RE_LPAR_RUN = re.compile(r'\(+')
+_RE_TRAIL_NUM = re.compile(r'[\d,.-]+$')
+_RE_NUM_ORPHAN_RPAR = re.compile(r'^[\d,.-]+\)$')
+# Row-level cascade patterns (clean_dataframe_parentheses):
+_RE_NUM_CASCADE = re.compile(r'^([\d,.-]+)\)\($')
+_RE_PCT_TRAIL = re.compile(r'(%)\s*\($')
+
+
+def _fix_cells(s):
+    """Apply the cell-level parenthesis fixes to a Series of strings.
 
-    Handles:
-    - Spaces inside parens: "( 297)" -> "(297)"
-    - Duplicate opening parens: "((123)" -> "(123)"
-    - Missing closing paren: "( 4410" -> "(4410)"
-    - Orphaned closing paren: "123)" -> "(123)"
+    Args:
+        s: pandas Series containing only strings
+
+    Returns:
+        pandas Series with the five paren patterns fixed
+    """
+    s = s.str.strip()
+
+    # Patterns 1-3: spaces inside parens, then duplicate opening parens
+    s = (s.str.replace(_RE_LPAR_SPACE, '(', regex=True)
+          .str.replace(_RE_SPACE_RPAR, ')', regex=True)
+          .str.replace(_RE_LPAR_RUN, '(', regex=True))
+
+    # Pattern 4: missing closing paren for negative numbers: "( 123" -> "(123)"
+    needs_close = (s.str.startswith('(') & ~s.str.endswith(')')
+                   & s.str.contains(_RE_TRAIL_NUM, na=False))
+    s = s.mask(needs_close, s + ')')
+
+    # Pattern 5: orphaned closing paren: "123)" -> "(123)"
+    return s.mask(s.str.match(_RE_NUM_ORPHAN_RPAR), '(' + s)
+
+
+def _cascade_sweep(df):
+    """Run the cross-cell parenthesis sweep over a DataFrame.
+
+    Each row is re-scanned left to right until nothing changes: one strip
+    can expose another trailing '(' (e.g. a '((' cell), so a single pass
+    does not reach the fixpoint. Rows are short, so the extra scans are
+    cheap next to the per-cell df.at indexing this replaces.
 
     Args:
-        value: Cell value to fix
+        df: pandas DataFrame to clean
 
     Returns:
-        Fixed cell value
+        pandas DataFrame with cascading parens resolved (same object when
+        nothing changed)
     """
-    if not isinstance(value, str):
-        return value
+    arr = df.to_numpy(dtype=object, copy=True)
+    nrows, ncols = arr.shape
+    mutated = False
+
+    for i in range(nrows):
+        changed = True
+        while changed:
+            changed = False
+
+            for j in range(ncols - 1):
+                curr_val = arr[i, j]
+                next_val = arr[i, j + 1]
+
+                # Cell ending with '(' : that '(' belongs to the next cell
+                if pd.notna(curr_val):
+                    curr_str = str(curr_val).strip()
 
-    val = str(value).strip()
+                    if curr_str.endswith('('):
+                        curr_str = curr_str[:-1].strip()
+                        arr[i, j] = curr_str if curr_str else None
+
+                        if pd.notna(next_val):
+                            next_str = str(next_val).strip()
+                            match = _RE_NUM_CASCADE.match(next_str)
+                            if match:
+                                # curr="X (" + next="123)(" -> curr="X" + next="(123)("
+                                # The trailing '(' cascades to the next pair
+                                arr[i, j + 1] = f'({match.group(1)})('
+                            else:
+                                # curr="X (" + next="123)" -> curr="X" + next="(123)"
+                                arr[i, j + 1] = '(' + next_str
+                        else:
+                            # Next cell is empty
+                            arr[i, j + 1] = '('
+                        changed = True
+                        mutated = True
+                        continue
 
-    # Pattern 1: Remove spaces after opening paren: "( 123)" -> "(123)"
-    val = re.sub(r'\(\s+', '(', val)
+                # ')(' pattern without an incoming '(' : the ')' belongs to the
+                # previous cell, e.g. curr="X" + next="3,094)(" -> "X)" + "(3,094)("
+                if pd.notna(next_val):
+                    next_str = str(next_val).strip()
+                    match = _RE_NUM_CASCADE.match(next_str)
+                    if match:
+                        curr_str = str(curr_val).strip() if pd.notna(curr_val) else ''
+                        arr[i, j] = (curr_str + ')') if curr_str else ')'
+                        arr[i, j + 1] = f'({match.group(1)})('
+                        changed = True
+                        mutated = True
 
-    # Pattern 2: Remove spaces before closing paren: "(123 )" -> "(123)"
-    val = re.sub(r'\s+\)', ')', val)
+    if mutated:
+        df = pd.DataFrame(arr, index=df.index, columns=df.columns).infer_objects()
 
-    # Pattern 3: Remove duplicate opening parens: "((123)" -> "(123)"
-    val = re.sub(r'\(+', '(', val)
+    return df
 
-    # Pattern 4: Fix missing closing paren for negative numbers: "( 123" -> "(123)"
-    # Only if it starts with ( and contains digits
-    if val.startswith('(') and not val.endswith(')'):
-        if re.search(r'[\d,.-]+$', val):
-            val = val + ')'
 
-    # Pattern 5: Fix orphaned closing paren: "123)" -> "(123)" if it looks like a negative number
-    if val.endswith(')') and not val.startswith('('):
-        # Check if it's a number followed by )
-        if re.match(r'^[\d,.-]+\)$', val):
-            val = '(' + val
+def clean_parentheses(df):
+    """Run the full parenthesis cleanup in a single fused pipeline.
 
-    return val
+    Equivalent to clean_dataframe_parentheses followed by
+    clean_malformed_parentheses, but each column is string-converted only
+    once: the cross-cell cascade runs first, then one vectorized pass
+    applies the percentage fixup and all five cell-level patterns together.
+
+    Args:
+        df: pandas DataFrame to clean
+
+    Returns:
+        pandas DataFrame with cleaned data
+    """
+    df = _cascade_sweep(df)
+
+    for col in df.columns:
+        values = df[col]
+        is_str = values.map(lambda v: isinstance(v, str))
+        if not is_str.any():
+            continue
+
+        s = values[is_str].str.strip()
+        # Percentage artifacts first (mirrors the old two-function order):
+        # "-3.34% (" -> "-3.34%"
+        s = s.str.replace(_RE_PCT_TRAIL, r'\1', regex=True)
+        s = _fix_cells(s)
+        df[col] = values.where(~is_str, s)
+
+    return df
 
 
 def clean_malformed_parentheses(df):
     """Clean malformed parentheses within individual cells.
 
     This is a post-processing step that fixes common OCR errors from Claude Vision API:
-    - Spaces inside parentheses
-    - Double opening parentheses
-    - Missing closing parentheses
-    - Orphaned closing parentheses
+    - Spaces inside parentheses: "( 297)" -> "(297)"
+    - Double opening parentheses: "((123)" -> "(123)"
+    - Missing closing parentheses: "( 4410" -> "(4410)"
+    - Orphaned closing parentheses: "123)" -> "(123)"
+
+    Each fix is applied to whole columns at once through pandas' vectorized
+    string kernels rather than a per-cell apply() loop; non-string cells are
+    left untouched.
 
     Args:
         df: pandas DataFrame to clean
@@ -64,7 +165,12 @@ def clean_malformed_parentheses(df):
         pandas DataFrame with cleaned data
     """
     for col in df.columns:
-        df[col] = df[col].apply(lambda x: _fix_cell_parens(x) if pd.notna(x) else x)
+        values = df[col]
+        is_str = values.map(lambda v: isinstance(v, str))
+        if not is_str.any():
+            continue
+
+        df[col] = values.where(~is_str, _fix_cells(values[is_str]))
 
     return df
 
@@ -86,88 +192,26 @@ def clean_dataframe_parentheses(df):
     - If next cell has ')(' pattern, split it: ) stays with current, number gets wrapped, ( cascades
     - Continue until no more trailing '(' found
 
+    The sweep runs over a plain NumPy array instead of per-cell df.at
+    indexing; each row is re-scanned until no change, as one strip can
+    expose another trailing '('.
+
     Args:
         df: pandas DataFrame to clean
 
     Returns:
         pandas DataFrame with cleaned data
     """
-    # Process each row
-    for idx in df.index:
-        # Keep processing until no more changes are made
-        changed = True
-        while changed:
-            changed = False
-
-            for col_idx in range(len(df.columns) - 1):
-                curr_col = df.columns[col_idx]
-                next_col = df.columns[col_idx + 1]
-
-                curr_val = df.at[idx, curr_col]
-                next_val = df.at[idx, next_col]
-
-                # Check if current cell ends with '('
-                if pd.notna(curr_val):
-                    curr_str = str(curr_val).strip()
-
-                    if curr_str.endswith('('):
-                        # Remove trailing '(' from current cell
-                        curr_str = curr_str[:-1].strip()
-
-                        # Process next cell
-                        if pd.notna(next_val):
-                            next_str = str(next_val).strip()
-
-                            # Check if next cell has ')(' pattern
-                            match = re.search(r'^([\d,.-]+)\)\($', next_str)
-                            if match:
-                                # Pattern: curr="X (" + next="123)("
-                                # With incoming (, next becomes (123) with trailing ( to cascade
-                                # Result: curr="X" + next="(123)("
-                                number = match.group(1)
-                                df.at[idx, curr_col] = curr_str if curr_str else None
-                                df.at[idx, next_col] = f'({number})('
-                                changed = True
-                            elif next_str.endswith(')') and not next_str.startswith('('):
-                                # Pattern: curr="X (" + next="123)"
-                                # Result: curr="X" + next="(123)"
-                                df.at[idx, curr_col] = curr_str if curr_str else None
-                                df.at[idx, next_col] = f'({next_str}'
-                                changed = True
-                            else:
-                                # Just move ( to beginning of next cell
-                                df.at[idx, curr_col] = curr_str if curr_str else None
-                                df.at[idx, next_col] = '(' + next_str
-                                changed = True
-                        else:
-                            # Next cell is empty
-                            df.at[idx, curr_col] = curr_str if curr_str else None
-                            df.at[idx, next_col] = '('
-                            changed = True
-
-                # Also check if next cell has ')(' pattern without incoming '('
-                # This handles cells like "3,094)(" where the ) should go to previous cell
-                if pd.notna(next_val):
-                    next_str = str(next_val).strip()
-                    match = re.search(r'^([\d,.-]+)\)\($', next_str)
-                    if match:
-                        # Check if current cell doesn't end with '('
-                        curr_str = str(curr_val).strip() if pd.notna(curr_val) else ''
-                        if not curr_str.endswith('('):
-                            # Pattern: curr="X" + next="123)("
-                            # Move ) to curr, wrap number, keep trailing (
-                            # Result: curr="X)" + next="(123)("
-                            number = match.group(1)
-                            df.at[idx, curr_col] = (curr_str + ')') if curr_str else ')'
-                            df.at[idx, next_col] = f'({number})('
-                            changed = True
+    df = _cascade_sweep(df)
 
     # Second pass: Clean up any remaining percentage artifacts
     # Pattern: "-3.34% (" should be "-3.34%"
     for col in df.columns:
-        df[col] = df[col].apply(
-            lambda x: re.sub(r'(%)\s*\($', r'\1', str(x).strip())
-            if pd.notna(x) and isinstance(x, str) else x
-        )
+        values = df[col]
+        is_str = values.map(lambda v: isinstance(v, str))
+        if not is_str.any():
+            continue
+        cleaned = values[is_str].str.strip().str.replace(_RE_PCT_TRAIL, r'\1', regex=True)
+        df[col] = values.where(~is_str, cleaned)
 
     return df
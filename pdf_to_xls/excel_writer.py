@@ -1,11 +1,23 @@
 """Excel file generation utilities."""
 
+import re
+
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 
 
+# Characters that mark a column as numeric-looking (currency, digits,
+# percentages, thousands separators) in add_rollup_formulas
+_NUM_CHARS = re.compile(r'[\d$%,]')
+
+# Naming patterns that mark a row as a rollup/summary row when no Row_Type
+# column is present; compiled once as a single alternation
+_ROLLUP_INDICATORS = ['total', 'gross', 'effective', 'net operating income', 'noi']
+_ROLLUP_RE = re.compile('|'.join(map(re.escape, _ROLLUP_INDICATORS)))
+
+
 def merge_continuation_tables(tables):
     """Merge tables that are continuations of each other across pages.
 
@@ -116,44 +128,32 @@ def merge_continuation_tables(tables):
 def identify_rollup_rows(df):
     """Identify rollup rows based on naming patterns and Row_Type column.
 
+    Both branches run as one vectorized column comparison instead of a
+    per-row df.loc loop.
+
     Args:
         df: pandas DataFrame
 
     Returns:
         list: List of row indices that are rollup/summary rows
     """
-    rollup_indicators = ['total', 'gross', 'effective', 'net operating income', 'noi']
-    rollup_rows = []
-
     # Check if Row_Type column exists
     if 'Row_Type' in df.columns:
-        for idx in df.index:
-            try:
-                row_type = df.loc[idx, 'Row_Type']
-                # Handle case where loc returns a Series
-                if isinstance(row_type, pd.Series):
-                    row_type = row_type.iloc[0] if len(row_type) > 0 else None
-                if pd.notna(row_type) and str(row_type).strip().upper() == 'ROLLUP':
-                    rollup_rows.append(idx)
-            except (KeyError, IndexError):
-                continue
+        col = df['Row_Type']
+        # Handle duplicate column labels (selection returns a DataFrame)
+        if isinstance(col, pd.DataFrame):
+            col = col.iloc[:, 0]
+        s = col.astype('string').str.strip().str.upper()
+        mask = (s == 'ROLLUP').fillna(False)
     else:
-        # Fallback: identify by naming patterns
-        first_col = df.columns[0]
-        for idx in df.index:
-            try:
-                value = df.loc[idx, first_col]
-                # Handle case where loc returns a Series
-                if isinstance(value, pd.Series):
-                    value = value.iloc[0] if len(value) > 0 else None
-                if pd.notna(value):
-                    value_lower = str(value).lower().strip()
-                    if any(indicator in value_lower for indicator in rollup_indicators):
-                        rollup_rows.append(idx)
-            except (KeyError, IndexError):
-                continue
-
-    return rollup_rows
+        # Fallback: identify by naming patterns in the first column
+        col = df[df.columns[0]]
+        if isinstance(col, pd.DataFrame):
+            col = col.iloc[:, 0]
+        s = col.astype('string').str.lower().str.strip()
+        mask = s.str.contains(_ROLLUP_RE, na=False)
+
+    return df.index[mask].tolist()
 
 
 def add_rollup_formulas(df, ws, rollup_rows):
@@ -165,21 +165,33 @@ def add_rollup_formulas(df, ws, rollup_rows):
         rollup_rows: List of row indices that are rollup rows
     """
     # Find label column names (usually first non-Row_Type column that contains text)
-    label_cols = ['Row_Type', 'INCOME', 'Category', 'EXPENSES', 'Subcategory', 'Description', 'Item']
+    label_cols = frozenset(
+        ['Row_Type', 'INCOME', 'Category', 'EXPENSES', 'Subcategory', 'Description', 'Item',
+         'Notes', 'notes', 'Note']
+    )
 
     # Find numeric columns (columns with currency/number patterns, exclude Row_Type, labels, and Notes)
-    numeric_cols = []
-    for col in df.columns:
-        # Skip if it's a label column or Notes
-        if col in label_cols or col in ['Notes', 'notes', 'Note']:
-            continue
-        # Check if column contains numeric-looking data (currency signs, numbers, percentages)
-        sample_values = df[col].dropna().head(5).astype(str)
-        if any(
-            any(char in str(val) for char in ['$', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '%', ','])
-            for val in sample_values
-        ):
-            numeric_cols.append(col)
+    # One vectorized regex scan over a five-value sample per column
+    numeric_cols = [
+        col for col in df.columns
+        if col not in label_cols
+        and df[col].dropna().head(5).astype(str).str.contains(_NUM_CHARS, na=False).any()
+    ]
+
+    # Normalize Row_Type once; the scan loops below index into a plain NumPy
+    # array by position instead of repeated df.at label lookups
+    if 'Row_Type' in df.columns:
+        row_types = df['Row_Type'].astype('string').str.strip().str.upper().to_numpy()
+    else:
+        row_types = None
+
+    # Resolve numeric column positions and Excel letters once, not per rollup
+    numeric_col_set = set(numeric_cols)
+    numeric_positions = [
+        (col_idx, get_column_letter(col_idx + 1))
+        for col_idx, col_name in enumerate(df.columns)
+        if col_name in numeric_col_set
+    ]
 
     for rollup_idx in rollup_rows:
         # Find the range of detail rows
@@ -189,49 +201,42 @@ def add_rollup_formulas(df, ws, rollup_rows):
         end_detail_idx = None
 
         # Try looking forward first (for cases like "Total Other Income" followed by "Parking", "Utility", etc.)
-        for i in range(rollup_idx + 1, len(df)):
-            if 'Row_Type' in df.columns:
-                row_type = df.at[i, 'Row_Type']
+        if row_types is not None:
+            for i in range(rollup_idx + 1, len(df)):
+                row_type = row_types[i]
                 if pd.notna(row_type):
-                    row_type_str = str(row_type).strip().upper()
-                    if row_type_str == 'DETAIL':
+                    if row_type == 'DETAIL':
                         if start_detail_idx is None:
                             start_detail_idx = i
                         end_detail_idx = i
-                    elif row_type_str in ['ROLLUP', 'HEADER']:
+                    elif row_type in ('ROLLUP', 'HEADER'):
                         # Stop at next rollup or header
                         break
 
-        # If no forward details found, look backwards (for cases like detail rows followed by "Total")
-        if start_detail_idx is None:
-            for i in range(rollup_idx - 1, -1, -1):
-                if 'Row_Type' in df.columns:
-                    row_type = df.at[i, 'Row_Type']
+            # If no forward details found, look backwards (for cases like detail rows followed by "Total")
+            if start_detail_idx is None:
+                for i in range(rollup_idx - 1, -1, -1):
+                    row_type = row_types[i]
                     if pd.notna(row_type):
-                        row_type_str = str(row_type).strip().upper()
-                        if row_type_str == 'DETAIL':
+                        if row_type == 'DETAIL':
                             if end_detail_idx is None:
                                 end_detail_idx = i
                             start_detail_idx = i
-                        elif row_type_str in ['ROLLUP', 'HEADER']:
+                        elif row_type in ('ROLLUP', 'HEADER'):
                             # Stop at previous rollup or header
                             break
 
         if start_detail_idx is not None and end_detail_idx is not None:
             # Add formulas for each numeric column ONLY
-            for col_idx, col_name in enumerate(df.columns):
-                if col_name in numeric_cols:
-                    # Excel row is +2 (1-indexed + header row)
-                    excel_row = rollup_idx + 2
-                    excel_start_row = start_detail_idx + 2
-                    excel_end_row = end_detail_idx + 2
-
-                    # Convert column index to Excel column letter
-                    excel_col = get_column_letter(col_idx + 1)
+            # Excel row is +2 (1-indexed + header row)
+            excel_row = rollup_idx + 2
+            excel_start_row = start_detail_idx + 2
+            excel_end_row = end_detail_idx + 2
 
-                    # Create SUM formula
-                    formula = f"=SUM({excel_col}{excel_start_row}:{excel_col}{excel_end_row})"
-                    ws.cell(row=excel_row, column=col_idx + 1, value=formula)
+            for col_idx, excel_col in numeric_positions:
+                # Create SUM formula
+                formula = f"=SUM({excel_col}{excel_start_row}:{excel_col}{excel_end_row})"
+                ws.cell(row=excel_row, column=col_idx + 1, value=formula)
 
 
 def extract_general_notes(df):
@@ -243,25 +248,23 @@ def extract_general_notes(df):
     Returns:
         list: List of general notes
     """
-    general_notes = []
+    if 'Notes' not in df.columns or 'Row_Type' not in df.columns:
+        return []
 
-    if 'Notes' in df.columns:
-        # Look for notes in header or standalone rows
-        for idx in df.index:
-            note = df.at[idx, 'Notes']
-            if pd.notna(note):
-                # Check if this is a general note (in a HEADER row or standalone)
-                if 'Row_Type' in df.columns:
-                    row_type = df.at[idx, 'Row_Type']
-                    if pd.notna(row_type) and str(row_type).strip().upper() == 'HEADER':
-                        general_notes.append(note)
-
-    return general_notes
+    # General notes live on HEADER rows; one vectorized mask finds them all
+    row_type = df['Row_Type'].astype('string').str.strip().str.upper()
+    mask = (row_type == 'HEADER').fillna(False) & df['Notes'].notna()
+    return df.loc[mask, 'Notes'].tolist()
 
 
 def save_excel_incremental(tables, output_path, current_page, total_pages):
     """Save progress to Excel file incrementally.
 
+    These intermediate saves are throwaway snapshots rewritten after every
+    few pages, so they use openpyxl's write-only mode: rows stream straight
+    to the XML serializer without building a Cell object graph, keeping each
+    save cheap even as the table count grows.
+
     Args:
         tables: List of table dictionaries
         output_path: Path to save Excel file
@@ -270,9 +273,7 @@ def save_excel_incremental(tables, output_path, current_page, total_pages):
     """
     try:
         print(f"  💾 Saving progress... ({current_page}/{total_pages} pages processed)")
-        wb = Workbook()
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
+        wb = Workbook(write_only=True)
 
         for idx, table_data in enumerate(tables, start=1):
             df = table_data['dataframe']
@@ -292,9 +293,11 @@ def save_excel_incremental(tables, output_path, current_page, total_pages):
 
             ws = wb.create_sheet(title=sheet_name)
 
-            for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=1):
-                for c_idx, value in enumerate(row, start=1):
-                    ws.cell(row=r_idx, column=c_idx, value=value)
+            # Stream rows straight to the serializer; itertuples is the
+            # cheapest row iteration pandas offers
+            ws.append(list(df.columns))
+            for row in df.itertuples(index=False, name=None):
+                ws.append(row)
 
         wb.save(output_path)
         print(f"  ✓ Progress saved: {len(tables)} tables")
@@ -305,6 +308,11 @@ def save_excel_incremental(tables, output_path, current_page, total_pages):
 def create_excel_file(tables, output_path):
     """Create Excel file from extracted tables.
 
+    Uses openpyxl's write-only mode, which serializes each appended row
+    immediately instead of keeping every cell in memory, so workbook size no
+    longer drives peak RAM - important when several conversions run
+    concurrently.
+
     Args:
         tables: List of table dictionaries with 'dataframe', 'page', and 'table' keys
         output_path: Path to save the Excel file
@@ -314,9 +322,7 @@ def create_excel_file(tables, output_path):
     """
     print(f"\nCreating Excel file with {len(tables)} table(s)...")
 
-    wb = Workbook()
-    if 'Sheet' in wb.sheetnames:
-        wb.remove(wb['Sheet'])
+    wb = Workbook(write_only=True)
 
     all_general_notes = []
 
@@ -348,21 +354,19 @@ def create_excel_file(tables, output_path):
 
         ws = wb.create_sheet(title=sheet_name)
 
-        # Write data to worksheet (with original values, no formulas)
-        for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=1):
-            for c_idx, value in enumerate(row, start=1):
-                ws.cell(row=r_idx, column=c_idx, value=value)
+        # Write data to worksheet (with original values, no formulas);
+        # write-only sheets are append-only, one streamed row at a time
+        for row in dataframe_to_rows(df, index=False, header=True):
+            ws.append(row)
 
         print(f"  Sheet {idx}: {sheet_name} (Page {page_num}, {len(df)} rows x {len(df.columns)} columns)")
 
     # Create separate Notes tab if there are general notes
     if all_general_notes:
         notes_ws = wb.create_sheet(title="Notes")
-        notes_ws.cell(row=1, column=1, value="Page")
-        notes_ws.cell(row=1, column=2, value="Note")
-        for note_idx, (page_num, note) in enumerate(all_general_notes, start=2):
-            notes_ws.cell(row=note_idx, column=1, value=f"Page {page_num}")
-            notes_ws.cell(row=note_idx, column=2, value=note)
+        notes_ws.append(["Page", "Note"])
+        for page_num, note in all_general_notes:
+            notes_ws.append([f"Page {page_num}", note])
         print(f"  ✓ Created Notes tab with {len(all_general_notes)} general note(s)")
 
     wb.save(output_path)
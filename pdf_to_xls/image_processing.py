@@ -1,22 +1,108 @@
 """Image processing and rotation detection utilities."""
 
-import base64
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from pathlib import Path
 import fitz  # PyMuPDF
 from PIL import Image
 import pytesseract
 
+from .logging_utils import logger, setup_worker_logging
+
+try:
+    # SIMD-accelerated drop-in replacement, 4-10x faster on multi-MB buffers
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import standard_b64encode as _b64encode
+
 
 # Claude API has a 5 MB limit for base64-encoded images
 MAX_IMAGE_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB
 
+# Claude downsizes images over 1568 px on the long edge server-side, so any
+# pixels beyond that only cost upload bytes and preprocessing latency
+MAX_IMAGE_EDGE_PX = 1568
+
+
+def _b64len(nbytes):
+    """Return the base64-encoded length of nbytes raw bytes.
+
+    Base64 is a pure 4/3 size function of the input, so the encoded size can
+    be computed without actually producing the encoded string.
+
+    Args:
+        nbytes: Number of raw bytes
+
+    Returns:
+        int: Length of the base64 encoding of that many bytes
+    """
+    return ((nbytes + 2) // 3) * 4
+
+
+def media_type_for_base64(image_data):
+    """Return the MIME type of a base64-encoded image payload.
+
+    The encoders in this module emit either JPEG or PNG; the base64 prefix is
+    enough to tell them apart ('/9j/' is the FF D8 FF JPEG signature, 'iVBOR'
+    the PNG one), so callers need no separate media-type channel.
+
+    Args:
+        image_data: Base64-encoded image string
+
+    Returns:
+        str: 'image/jpeg' or 'image/png'
+    """
+    return 'image/jpeg' if image_data.startswith('/9j/') else 'image/png'
+
+
+def _encode_image_for_api(img, max_size_bytes=MAX_IMAGE_SIZE_BYTES, max_edge_px=MAX_IMAGE_EDGE_PX):
+    """Encode a page image for API transport, preferring JPEG.
+
+    The image is first clamped to max_edge_px on its long edge - the API
+    resizes anything larger before the model sees it, so sending more pixels
+    only inflates the payload. JPEG compresses rendered text-on-white pages
+    5-20x smaller than PNG and encodes much faster, which usually puts the
+    image under the size budget without any further resizing. Falls back to
+    the PNG resize loop otherwise.
+
+    Args:
+        img: PIL Image object
+        max_size_bytes: Maximum size for the base64-encoded image
+        max_edge_px: Long-edge pixel cap before encoding (default: 1568,
+            Claude's server-side limit); pass None to disable
+
+    Returns:
+        bytes: Encoded image bytes (JPEG, or PNG after resizing)
+    """
+    long_edge = max(img.width, img.height)
+    if max_edge_px and long_edge > max_edge_px:
+        scale = max_edge_px / long_edge
+        img = img.resize(
+            (max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+
+    jpeg_img = img.convert('RGB') if img.mode not in ('RGB', 'L') else img
+    output = BytesIO()
+    jpeg_img.save(output, format='JPEG', quality=85)
+    jpeg_bytes = output.getvalue()
+    if _b64len(len(jpeg_bytes)) <= max_size_bytes:
+        return jpeg_bytes
+
+    img = resize_image_for_api(img, max_size_bytes)
+    output = BytesIO()
+    img.save(output, format='PNG', optimize=False, compress_level=1)
+    return output.getvalue()
+
 
 def resize_image_for_api(img, max_size_bytes=MAX_IMAGE_SIZE_BYTES):
     """Resize image to fit within API size limit.
 
     Iteratively reduces image dimensions until the base64-encoded PNG
-    is under the specified size limit.
+    is under the specified size limit. Each probe only PNG-encodes the
+    image; the base64 size is computed arithmetically via _b64len rather
+    than paying for a throwaway encode of megabytes of data.
 
     Args:
         img: PIL Image object
@@ -25,20 +111,22 @@ def resize_image_for_api(img, max_size_bytes=MAX_IMAGE_SIZE_BYTES):
     Returns:
         PIL Image object: Resized image that fits within size limit
     """
-    # Start with original image
-    current_img = img.copy()
-    scale_factor = 1.0
-
-    # Get initial size
+    # Probe the original directly; copying a 4x-zoom page up front would
+    # allocate and memcpy hundreds of MB even when no resize is needed.
+    # compress_level=1 encodes ~3x faster than the default with only a small
+    # size penalty, and the final encode uses it too, so the probe measures
+    # what actually gets sent
     output = BytesIO()
-    current_img.save(output, format='PNG')
-    current_size = len(base64.standard_b64encode(output.getvalue()))
+    img.save(output, format='PNG', optimize=False, compress_level=1)
+    current_size = _b64len(len(output.getvalue()))
 
     # If already under limit, return original
     if current_size <= max_size_bytes:
-        return current_img
+        return img
+
+    current_img = img
 
-    print(f"    Image size {current_size:,} bytes exceeds {max_size_bytes:,} byte limit, resizing...")
+    logger.info(f"    Image size {current_size:,} bytes exceeds {max_size_bytes:,} byte limit, resizing...")
 
     # Iteratively reduce size until under limit
     # Start with aggressive reduction based on size ratio
@@ -62,7 +150,7 @@ def resize_image_for_api(img, max_size_bytes=MAX_IMAGE_SIZE_BYTES):
 
         # Ensure minimum dimensions
         if new_width < 100 or new_height < 100:
-            print(f"    Warning: Image dimensions too small ({new_width}x{new_height}), using minimum size")
+            logger.info(f"    Warning: Image dimensions too small ({new_width}x{new_height}), using minimum size")
             new_width = max(new_width, 100)
             new_height = max(new_height, 100)
 
@@ -71,21 +159,86 @@ def resize_image_for_api(img, max_size_bytes=MAX_IMAGE_SIZE_BYTES):
 
         # Check new size
         output = BytesIO()
-        current_img.save(output, format='PNG')
-        current_size = len(base64.standard_b64encode(output.getvalue()))
+        current_img.save(output, format='PNG', optimize=False, compress_level=1)
+        current_size = _b64len(len(output.getvalue()))
 
         if current_size > max_size_bytes:
-            # Reduce scale factor further for next attempt
-            scale_factor *= 0.85
+            # The sqrt-based first guess is almost always close; if two
+            # attempts were not enough, decay much harder to converge fast
+            scale_factor *= 0.85 if attempts < 2 else 0.7
 
-    print(f"    Resized to {current_img.width}x{current_img.height} ({current_size:,} bytes)")
+    logger.info(f"    Resized to {current_img.width}x{current_img.height} ({current_size:,} bytes)")
 
     return current_img
 
 
+@contextlib.contextmanager
+def open_pdf(pdf_path):
+    """Open a PDF document once for rendering several pages.
+
+    fitz.open parses the xref table and loads fonts on every call, which
+    adds up fast on long documents; callers looping over pages should open
+    the document once and pass it to convert_pdf_page_to_image.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Yields:
+        fitz.Document: The open document (closed on exit)
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+
+def _convert_one(args):
+    """Render one page in a worker process (module-level for pickling).
+
+    Args:
+        args: (pdf_path, page_num) tuple
+
+    Returns:
+        str: Base64-encoded image data, or None if conversion fails
+    """
+    # Forked workers inherit the parent's queue handler without its
+    # listener thread; replace it so per-page diagnostics still appear
+    setup_worker_logging()
+    pdf_path, page_num = args
+    return convert_pdf_page_to_image(pdf_path, page_num)
+
+
+def convert_pages_parallel(pdf_path, page_nums, workers=None):
+    """Render several PDF pages concurrently across CPU cores.
+
+    Page rendering, OSD, and image encoding are CPU-bound, so a process pool
+    scales them with core count. Each worker opens its own fitz.Document
+    (fitz documents are not process-safe).
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_nums: Iterable of 1-indexed page numbers to render
+        workers: Max worker processes (default: CPU count)
+
+    Returns:
+        dict: {page_num: base64 image data or None} for every requested page
+    """
+    page_nums = list(page_nums)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        images = executor.map(_convert_one, [(str(pdf_path), p) for p in page_nums])
+        return dict(zip(page_nums, images))
+
+
 def detect_orientation(img):
     """Detect image orientation using pytesseract OSD.
 
+    The 4x-zoomed page renders are far larger than OSD needs - script
+    orientation is reliable at roughly 150 DPI - so the probe is downscaled
+    to ~1000 px on the long edge first. Tesseract's OSD runtime is roughly
+    linear in pixel count, which makes the downscaled call ~10x faster with
+    the same rotation answer.
+
     Args:
         img: PIL Image object
 
@@ -95,8 +248,17 @@ def detect_orientation(img):
             - confidence: Confidence level of the detection
     """
     try:
+        # Downscale the probe; BILINEAR is plenty for orientation detection
+        width, height = img.size
+        scale = min(1.0, 1000.0 / max(width, height))
+        probe = img
+        if scale < 1.0:
+            probe = img.resize(
+                (int(width * scale), int(height * scale)), Image.Resampling.BILINEAR
+            )
+
         # Use pytesseract to detect orientation
-        osd = pytesseract.image_to_osd(img)
+        osd = pytesseract.image_to_osd(probe)
 
         # Parse the OSD output to get rotation angle
         rotation = 0
@@ -114,15 +276,17 @@ def detect_orientation(img):
 
 
 def convert_image_file_to_base64(image_path):
-    """Convert an image file to base64-encoded PNG.
+    """Convert an image file to a base64-encoded image payload.
 
-    Automatically detects and corrects image orientation.
+    Automatically detects and corrects image orientation. The payload is
+    JPEG where possible, PNG otherwise; use media_type_for_base64 to get the
+    matching MIME type.
 
     Args:
         image_path: Path to the image file (.jpg, .jpeg, .png, .tiff, .tif)
 
     Returns:
-        str: Base64-encoded PNG image data, or None if conversion fails
+        str: Base64-encoded image data, or None if conversion fails
     """
     try:
         image_path = Path(image_path)
@@ -145,91 +309,113 @@ def convert_image_file_to_base64(image_path):
             # - Therefore: PIL_angle = -Tesseract_angle to convert conventions
             # - expand=True ensures the canvas expands to fit the rotated image without cropping
             img = img.rotate(-detected_rotation, expand=True)
-            print(f"    Detected rotation {detected_rotation}° (confidence: {confidence:.1f}) - correcting")
-
-        # Resize image if needed to fit within API size limit
-        img = resize_image_for_api(img)
-
-        # Convert PIL Image to PNG bytes
-        output = BytesIO()
-        img.save(output, format='PNG')
-        final_img_data = output.getvalue()
+            logger.info(f"    Detected rotation {detected_rotation}° (confidence: {confidence:.1f}) - correcting")
 
-        # Encode to base64
-        return base64.standard_b64encode(final_img_data).decode('utf-8')
+        # Encode for transport (JPEG preferred; resizes only if needed).
+        # Drop the PIL image and raw bytes before returning so only the
+        # base64 payload stays live while the API call is in flight.
+        final_img_data = _encode_image_for_api(img)
+        del img
+        encoded = _b64encode(final_img_data).decode('ascii')
+        del final_img_data
+        return encoded
 
     except Exception as e:
-        print(f"    Error converting image to base64: {e}")
+        logger.info(f"    Error converting image to base64: {e}")
         import traceback
         traceback.print_exc()
         return None
 
 
-def convert_pdf_page_to_image(pdf_path, page_num):
-    """Convert a PDF page to base64-encoded image using PyMuPDF.
+def convert_pdf_page_to_image(pdf_path, page_num, detect_rotation=True,
+                              max_edge_px=MAX_IMAGE_EDGE_PX):
+    """Convert a PDF page to a base64-encoded image using PyMuPDF.
 
-    Automatically detects and corrects page orientation.
+    Automatically detects and corrects page orientation. The payload is
+    JPEG where possible, PNG otherwise; use media_type_for_base64 to get the
+    matching MIME type.
 
     Args:
-        pdf_path: Path to the PDF file
+        pdf_path: Path to the PDF file, or an already-open fitz.Document
+            (e.g. from open_pdf) to amortize the open cost across pages
         page_num: Page number (1-indexed)
+        detect_rotation: Run Tesseract OSD orientation detection when the
+            page has no embedded rotation (default: True); callers that know
+            the orientation can disable it
+        max_edge_px: Long-edge pixel cap for the encoded payload
+            (default: 1568, Claude's server-side limit)
 
     Returns:
-        str: Base64-encoded PNG image data, or None if conversion fails
+        str: Base64-encoded image data, or None if conversion fails
     """
     try:
-        # Open PDF with PyMuPDF
-        doc = fitz.open(pdf_path)
+        # Open PDF with PyMuPDF unless the caller already did
+        if isinstance(pdf_path, fitz.Document):
+            doc = pdf_path
+            owns_doc = False
+        else:
+            doc = fitz.open(pdf_path)
+            owns_doc = True
 
         # Get the page (0-indexed)
         page = doc[page_num - 1]
 
+        # Embedded /Rotate attribute; get_pixmap already applies it when
+        # rendering, so a nonzero value means orientation is known good
+        embedded_rotation = page.rotation
+
         # Render page to image at high resolution
         # Use 4x zoom for better OCR accuracy, especially for tables with many columns
         # Higher resolution is critical for wide tables with small text
         mat = fitz.Matrix(4.0, 4.0)  # 4x zoom for better quality
         pix = page.get_pixmap(matrix=mat)
 
-        # Convert to PIL Image
-        img_bytes = pix.tobytes("png")
-        img = Image.open(BytesIO(img_bytes))
-
-        print(f"    Initial image size: {img.width}x{img.height} pixels")
-
-        # Close document
-        doc.close()
-
-        # Detect actual visual orientation using OCR
-        detected_rotation, confidence = detect_orientation(img)
-
-        # Apply rotation correction if needed (only if confidence is reasonable)
-        if detected_rotation != 0 and confidence > 1.0:
-            # Rotation direction conversion:
-            # - Tesseract OSD "Rotate" value = degrees to rotate CLOCKWISE to correct orientation
-            # - PIL's rotate() method rotates COUNTER-CLOCKWISE by default
-            # - Therefore: PIL_angle = -Tesseract_angle to convert conventions
-            # - expand=True ensures the canvas expands to fit the rotated image without cropping
-            # Example: If text is 90° clockwise (sideways right), Tesseract returns 270,
-            #          and rotate(-270) = rotate 90° clockwise = corrects the orientation
-            img = img.rotate(-detected_rotation, expand=True)
-            print(f"    Detected rotation {detected_rotation}° (confidence: {confidence:.1f}) - correcting")
-
-        # Resize image if needed to fit within API size limit
-        img = resize_image_for_api(img)
-        print(f"    Final image size: {img.width}x{img.height} pixels")
-
-        # Convert PIL Image to PNG bytes
-        output = BytesIO()
-        img.save(output, format='PNG')
-        final_img_data = output.getvalue()
-        final_size_mb = len(base64.standard_b64encode(final_img_data)) / (1024 * 1024)
-        print(f"    Final encoded size: {final_size_mb:.2f} MB")
-
-        # Encode to base64
-        return base64.standard_b64encode(final_img_data).decode('utf-8')
+        # Wrap the raw pixel buffer directly; round-tripping through
+        # pix.tobytes("png") + Image.open would pay a full PNG encode and
+        # decode just to obtain a PIL image
+        mode = 'RGBA' if pix.alpha else 'RGB'
+        img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+
+        logger.info(f"    Initial image size: {img.width}x{img.height} pixels")
+
+        # Close document (only if opened here)
+        if owns_doc:
+            doc.close()
+
+        # Only fall back to Tesseract OSD (a slow subprocess spawn per page)
+        # when the PDF itself does not declare a rotation; scanned pages with
+        # /Rotate 0 may still be visually sideways
+        if detect_rotation and embedded_rotation == 0:
+            # Detect actual visual orientation using OCR
+            detected_rotation, confidence = detect_orientation(img)
+
+            # Apply rotation correction if needed (only if confidence is reasonable)
+            if detected_rotation != 0 and confidence > 1.0:
+                # Rotation direction conversion:
+                # - Tesseract OSD "Rotate" value = degrees to rotate CLOCKWISE to correct orientation
+                # - PIL's rotate() method rotates COUNTER-CLOCKWISE by default
+                # - Therefore: PIL_angle = -Tesseract_angle to convert conventions
+                # - expand=True ensures the canvas expands to fit the rotated image without cropping
+                # Example: If text is 90° clockwise (sideways right), Tesseract returns 270,
+                #          and rotate(-270) = rotate 90° clockwise = corrects the orientation
+                img = img.rotate(-detected_rotation, expand=True)
+                logger.info(f"    Detected rotation {detected_rotation}° (confidence: {confidence:.1f}) - correcting")
+
+        # Encode for transport (JPEG preferred; resizes only if needed)
+        final_img_data = _encode_image_for_api(img, max_edge_px=max_edge_px)
+        final_size_mb = _b64len(len(final_img_data)) / (1024 * 1024)
+        logger.info(f"    Final encoded size: {final_size_mb:.2f} MB")
+
+        # Encode to base64, releasing the raw bytes (and the rendered PIL
+        # image) immediately - with several pages in flight only the base64
+        # payload should stay live per page
+        del img
+        encoded = _b64encode(final_img_data).decode('ascii')
+        del final_img_data
+        return encoded
 
     except Exception as e:
-        print(f"    Error converting page to image: {e}")
+        logger.info(f"    Error converting page to image: {e}")
         import traceback
         traceback.print_exc()
         return None
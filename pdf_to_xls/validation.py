@@ -1,12 +1,53 @@
-"""Validation utilities for verifying extracted data accuracy."""
+"""Validation utilities for verifying extracted data accuracy.
 
+Note: the pdfplumber-rs wheel installs under the same ``pdfplumber`` module
+name (there is no ``pdfplumber_rs`` import), so installing it swaps the Rust
+implementation in for every pdfplumber user in this package at once - the
+text extraction here, but also the table extraction paths, whose API
+coverage there is unverified. Do not install it alongside regular
+pdfplumber; pip lets the two packages overwrite each other's files.
+"""
+
+import multiprocessing
 import re
+import weakref
 from pathlib import Path
 import pdfplumber
 import pandas as pd
 from collections import Counter
 
 
+# Pattern to match numbers with optional commas, decimals, parentheses,
+# dollar signs. Examples: 1,234.56, (123.45), $1,234, 50%, etc.
+# Compiled once at import; this runs per page and per dataframe cell, so
+# even the re.cache dict lookup per call is worth skipping.
+_NUMBER_PATTERN = r'\$?\(?\d{1,3}(?:,\d{3})*(?:\.\d+)?\)?%?'
+
+# The dataframe path must stay a stdlib re.Pattern: pandas str.findall
+# passes it back through re.compile, which rejects foreign pattern objects
+_NUMBER_RE = re.compile(_NUMBER_PATTERN)
+
+try:
+    # DFA-backed engine (pip install google-re2): linear-time scanning over
+    # full page texts instead of sre's backtracking matcher
+    import re2
+
+    _SCAN_RE = re2.compile(_NUMBER_PATTERN)
+except ImportError:
+    _SCAN_RE = _NUMBER_RE
+
+# Deletion table for formatting characters; one str.translate pass replaces
+# three str.replace scans per matched number
+_STRIP_FORMAT = str.maketrans('', '', '$,%')
+
+# Cheap prefilter for prose-only pages: a single-class re.search runs as a
+# memchr-style scan and returns in microseconds on digit-free text
+_HAS_DIGIT = re.compile(r'\d')
+
+# Metadata columns that never hold table values; excluded from validation
+_SKIP_COLUMNS = frozenset({'Row_Type', 'Category', 'Notes'})
+
+
 def extract_numbers_from_text(text):
     """Extract all numbers from text string.
 
@@ -16,43 +57,95 @@ def extract_numbers_from_text(text):
     Returns:
         list: List of number strings (preserves formatting like commas, parentheses)
     """
-    # Pattern to match numbers with optional commas, decimals, parentheses, dollar signs
-    # Examples: 1,234.56, (123.45), $1,234, 50%, etc.
-    pattern = r'\$?\(?\d{1,3}(?:,\d{3})*(?:\.\d+)?\)?%?'
-    numbers = re.findall(pattern, text)
+    # Narrative pages in filings are often digit-free; skip the full number
+    # scan for them
+    if not _HAS_DIGIT.search(text):
+        return []
 
-    # Clean up numbers for comparison
     cleaned = []
-    for num in numbers:
+    for num in _SCAN_RE.findall(text):
         # Remove formatting but preserve negative sign (parentheses)
-        cleaned_num = num.replace('$', '').replace(',', '').replace('%', '')
+        num = num.translate(_STRIP_FORMAT)
         # Convert (123) to -123 for comparison
-        if cleaned_num.startswith('(') and cleaned_num.endswith(')'):
-            cleaned_num = '-' + cleaned_num[1:-1]
-        cleaned.append(cleaned_num)
+        if num[0] == '(' and num[-1] == ')':
+            num = '-' + num[1:-1]
+        cleaned.append(num)
 
     return cleaned
 
 
-def extract_numbers_from_pdf(pdf_path):
+def _extract_page_numbers(args):
+    """Extract numbers from one PDF page in a worker process.
+
+    Module-level so multiprocessing can pickle it; each worker opens its own
+    pdfplumber handle for just its page.
+
+    Args:
+        args: (pdf_path, page_num) tuple
+
+    Returns:
+        tuple: (page_num, numbers) where numbers is the list of number
+            strings, or None if the page has no text layer
+    """
+    pdf_path, page_num = args
+    with pdfplumber.open(pdf_path, pages=[page_num]) as pdf:
+        text = pdf.pages[0].extract_text()
+    return page_num, extract_numbers_from_text(text) if text else None
+
+
+def extract_numbers_from_pdf(pdf_path, page_workers=None, accumulator=None):
     """Extract all numbers from PDF text.
 
+    Text extraction is pure-Python pdfminer CPU work, so long documents are
+    fanned out over a process pool; short ones stay in-process where the
+    fork cost would not pay off.
+
     Args:
         pdf_path: Path to PDF file
+        page_workers: Worker process count (default: CPU count); pass 1 to
+            process pages in this process
+        accumulator: Optional Counter; when given, each page's numbers are
+            folded straight into it (float-normalized) as the page finishes,
+            so no per-page string lists are retained - peak memory becomes
+            O(unique numbers) instead of O(total numbers)
 
     Returns:
-        dict: Dictionary mapping page numbers to lists of numbers
+        dict: Dictionary mapping page numbers to lists of numbers, or to
+            per-page number counts when an accumulator is given
     """
     pdf_path = Path(pdf_path)
     page_numbers = {}
 
+    def record(page_num, numbers):
+        if accumulator is None:
+            page_numbers[page_num] = numbers
+        else:
+            accumulator.update(_count_numbers(numbers))
+            page_numbers[page_num] = len(numbers)
+
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text()
-                if text:
-                    numbers = extract_numbers_from_text(text)
-                    page_numbers[page_num] = numbers
+            num_pages = len(pdf.pages)
+            if num_pages <= 10 or page_workers == 1:
+                for page_num, page in enumerate(pdf.pages, start=1):
+                    text = page.extract_text()
+                    if text:
+                        record(page_num, extract_numbers_from_text(text))
+                return page_numbers
+    except Exception as e:
+        print(f"Warning: Could not extract text from PDF for validation: {e}")
+        return {}
+
+    # Workers get only (path, page_num) - never pickled pdfplumber objects -
+    # and each re-opens the PDF for its page. Results come back unordered;
+    # the dict is keyed by page number so order does not matter.
+    page_args = [(str(pdf_path), page_num) for page_num in range(1, num_pages + 1)]
+    try:
+        with multiprocessing.Pool(processes=page_workers) as pool:
+            for page_num, numbers in pool.imap_unordered(
+                    _extract_page_numbers, page_args, chunksize=4):
+                if numbers is not None:
+                    record(page_num, numbers)
     except Exception as e:
         print(f"Warning: Could not extract text from PDF for validation: {e}")
         return {}
@@ -60,30 +153,90 @@ def extract_numbers_from_pdf(pdf_path):
     return page_numbers
 
 
+# Extracted-number memo keyed by id(df). DataFrames are unhashable, so a
+# WeakKeyDictionary cannot hold them; instead a weakref.finalize on each
+# cached frame drops its entry at garbage collection, which also prevents a
+# recycled id from serving another frame's numbers. The shape check guards
+# against in-place growth between calls.
+_numbers_cache = {}
+
+
 def extract_numbers_from_dataframe(df):
     """Extract all numbers from a dataframe.
 
+    Results are memoized per DataFrame instance, so repeated validation or
+    stats passes over the same tables do not redo the O(cells) regex scan.
+
     Args:
         df: pandas DataFrame
 
     Returns:
         list: List of number strings
     """
-    numbers = []
+    cached = _numbers_cache.get(id(df))
+    if cached is not None and cached[0] == df.shape:
+        return list(cached[1])
+
+    numbers = _extract_numbers_uncached(df)
+    _numbers_cache[id(df)] = (df.shape, numbers)
+    weakref.finalize(df, _numbers_cache.pop, id(df), None)
+    return list(numbers)
+
+
+def _extract_numbers_uncached(df):
+    cols = [c for c in df.columns if c not in _SKIP_COLUMNS]
+    if not cols:
+        return []
+
+    # Flatten the value columns and run the regex through pandas' string
+    # methods rather than a Python loop per cell - the findall/explode and
+    # the formatting cleanup all stay in C for tables with thousands of cells
+    values = pd.Series(df[cols].to_numpy().ravel())
+    values = values[values.notna()].astype(str)
+    if values.empty:
+        return []
+
+    raw = values.str.findall(_NUMBER_RE).explode().dropna()
+    if raw.empty:
+        return []
+
+    # Remove formatting but preserve negative sign (parentheses)
+    raw = (raw.str.replace('$', '', regex=False)
+              .str.replace(',', '', regex=False)
+              .str.replace('%', '', regex=False))
+    # Convert (123) to -123 for comparison
+    neg = raw.str.startswith('(') & raw.str.endswith(')')
+    raw = raw.mask(neg, '-' + raw.str.slice(1, -1))
 
-    for col in df.columns:
-        # Skip Row_Type and Category columns
-        if col in ['Row_Type', 'Category', 'Notes']:
-            continue
+    return raw.tolist()
 
-        for val in df[col]:
-            if pd.notna(val):
-                val_str = str(val)
-                # Extract numbers from the value
-                extracted = extract_numbers_from_text(val_str)
-                numbers.extend(extracted)
 
-    return numbers
+def _count_numbers(numbers):
+    """Count occurrences of number strings, normalized to float where possible.
+
+    pd.to_numeric parses the whole batch in C and value_counts hashes it in
+    one pass, replacing a float()/except round-trip per element; strings
+    that do not parse (stray parentheses and the like) are counted as-is,
+    matching the old ValueError branch.
+
+    Args:
+        numbers: List of number strings
+
+    Returns:
+        Counter: Mapping of float (or unparseable string) to occurrence count
+    """
+    counts = Counter()
+    if not numbers:
+        return counts
+
+    s = pd.Series(numbers, dtype=object)
+    floats = pd.to_numeric(s, errors='coerce')
+    parsed = floats.notna()
+    for val, count in floats[parsed].astype(float).value_counts().items():
+        counts[val] = int(count)
+    for val, count in s[~parsed].value_counts().items():
+        counts[val] = int(count)
+    return counts
 
 
 def validate_extracted_data(pdf_path, tables, output_path=None):
@@ -102,8 +255,10 @@ def validate_extracted_data(pdf_path, tables, output_path=None):
     """
     pdf_path = Path(pdf_path)
 
-    # Extract numbers from PDF text
-    pdf_numbers_by_page = extract_numbers_from_pdf(pdf_path)
+    # Extract numbers from PDF text, folding each page into the counter as
+    # it finishes so the full per-page string lists are never held at once
+    pdf_number_set = Counter()
+    pdf_numbers_by_page = extract_numbers_from_pdf(pdf_path, accumulator=pdf_number_set)
 
     if not pdf_numbers_by_page:
         # Generate report even when validation is skipped
@@ -117,86 +272,61 @@ def validate_extracted_data(pdf_path, tables, output_path=None):
             # Change extension to .md
             output_path = output_path.parent / f"{output_path.stem}.md"
 
-            report_lines = []
-            report_lines.append("# Data Validation Report")
-            report_lines.append("")
-            report_lines.append(f"**Source PDF:** `{pdf_path.name}`")
-            report_lines.append("")
-            report_lines.append("## ⚠️ Validation Skipped")
-            report_lines.append("")
-            report_lines.append("**Reason:** Could not extract text from PDF for validation.")
-            report_lines.append("")
-            report_lines.append("This typically occurs when:")
-            report_lines.append("- The PDF is purely image-based (scanned document)")
-            report_lines.append("- The PDF has no text layer")
-            report_lines.append("- An error occurred during text extraction")
-            report_lines.append("")
-            report_lines.append("## 📋 Recommendation")
-            report_lines.append("")
-            report_lines.append("Please manually verify the extracted data against the source PDF.")
-            report_lines.append("Since automatic validation was not possible, careful review is recommended.")
-            report_lines.append("")
-            report_lines.append("---")
-            report_lines.append("")
-            report_lines.append(f"*Report generated automatically by pdf-to-xls-vision*")
-
             # Write report
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(report_lines))
+                f.write(
+                    "# Data Validation Report\n"
+                    "\n"
+                    f"**Source PDF:** `{pdf_path.name}`\n"
+                    "\n"
+                    "## ⚠️ Validation Skipped\n"
+                    "\n"
+                    "**Reason:** Could not extract text from PDF for validation.\n"
+                    "\n"
+                    "This typically occurs when:\n"
+                    "- The PDF is purely image-based (scanned document)\n"
+                    "- The PDF has no text layer\n"
+                    "- An error occurred during text extraction\n"
+                    "\n"
+                    "## 📋 Recommendation\n"
+                    "\n"
+                    "Please manually verify the extracted data against the source PDF.\n"
+                    "Since automatic validation was not possible, careful review is recommended.\n"
+                    "\n"
+                    "---\n"
+                    "\n"
+                    "*Report generated automatically by pdf-to-xls-vision*"
+                )
 
             print(f"  ⚠️  Validation skipped - see report: {output_path}")
 
         return report
 
-    # Collect all PDF numbers
-    all_pdf_numbers = []
-    for page_nums in pdf_numbers_by_page.values():
-        all_pdf_numbers.extend(page_nums)
-
-    # Extract numbers from tables
-    all_table_numbers = []
+    # Extract numbers from tables, one counter fold per table
+    table_number_set = Counter()
     for table in tables:
-        df = table['dataframe']
-        table_nums = extract_numbers_from_dataframe(df)
-        all_table_numbers.extend(table_nums)
-
-    # Convert to float for comparison (where possible)
-    pdf_number_set = Counter()
-    for num in all_pdf_numbers:
-        try:
-            # Normalize to float
-            float_val = float(num)
-            pdf_number_set[float_val] += 1
-        except ValueError:
-            # Keep as string if can't convert
-            pdf_number_set[num] += 1
+        table_number_set.update(_count_numbers(extract_numbers_from_dataframe(table['dataframe'])))
 
-    table_number_set = Counter()
-    for num in all_table_numbers:
-        try:
-            float_val = float(num)
-            table_number_set[float_val] += 1
-        except ValueError:
-            table_number_set[num] += 1
-
-    # Find discrepancies
+    # Find discrepancies and count matches (numbers that appear the same
+    # number of times in both) in a single pass over the keys union; the
+    # keys() | keys() view union skips the intermediate set copies
     missing_in_tables = []
     extra_in_tables = []
+    matches = 0
 
-    # Numbers in PDF but not in tables (or wrong count)
-    for num, pdf_count in pdf_number_set.items():
+    for num in pdf_number_set.keys() | table_number_set.keys():
+        pdf_count = pdf_number_set.get(num, 0)
         table_count = table_number_set.get(num, 0)
+        matches += pdf_count if pdf_count < table_count else table_count
         if table_count < pdf_count:
+            # Number in PDF but not in tables (or wrong count)
             missing_in_tables.append({
                 'number': num,
                 'pdf_count': pdf_count,
                 'table_count': table_count
             })
-
-    # Numbers in tables but not in PDF (or wrong count)
-    for num, table_count in table_number_set.items():
-        pdf_count = pdf_number_set.get(num, 0)
-        if table_count > pdf_count:
+        elif table_count > pdf_count:
+            # Number in tables but not in PDF (or wrong count)
             extra_in_tables.append({
                 'number': num,
                 'pdf_count': pdf_count,
@@ -207,10 +337,6 @@ def validate_extracted_data(pdf_path, tables, output_path=None):
     total_pdf_numbers = sum(pdf_number_set.values())
     total_table_numbers = sum(table_number_set.values())
 
-    # Count matches (numbers that appear same number of times in both)
-    matches = sum(min(pdf_number_set[num], table_number_set[num])
-                  for num in set(pdf_number_set.keys()) | set(table_number_set.keys()))
-
     accuracy = (matches / total_pdf_numbers * 100) if total_pdf_numbers > 0 else 0
 
     # Generate report
@@ -234,76 +360,94 @@ def validate_extracted_data(pdf_path, tables, output_path=None):
         # Change extension to .md
         output_path = output_path.parent / f"{output_path.stem}.md"
 
-        report_lines = []
-        report_lines.append("# Data Validation Report")
-        report_lines.append("")
-        report_lines.append(f"**Source PDF:** `{pdf_path.name}`")
-        report_lines.append("")
-        report_lines.append("## Summary")
-        report_lines.append("")
-        report_lines.append(f"| Metric | Count |")
-        report_lines.append(f"|--------|-------|")
-        report_lines.append(f"| Total numbers in PDF | {total_pdf_numbers:,} |")
-        report_lines.append(f"| Total numbers in tables | {total_table_numbers:,} |")
-        report_lines.append(f"| Matching numbers | {matches:,} |")
-        report_lines.append(f"| **Accuracy** | **{accuracy:.2f}%** |")
-        report_lines.append("")
-
-        if missing_in_tables:
-            report_lines.append("## ⚠️ Numbers in PDF but Missing/Undercounted in Tables")
-            report_lines.append("")
-            report_lines.append(f"**Found {len(missing_in_tables)} discrepancies**")
-            report_lines.append("")
-            report_lines.append("| Number | PDF Count | Table Count | Difference |")
-            report_lines.append("|--------|-----------|-------------|------------|")
-            for item in missing_in_tables:
-                diff = item['pdf_count'] - item['table_count']
-                report_lines.append(f"| {item['number']:>15} | {item['pdf_count']:>9} | {item['table_count']:>11} | {diff:>10} |")
-            report_lines.append("")
-
-        if extra_in_tables:
-            report_lines.append("## ⚠️ Numbers in Tables but Missing/Undercounted in PDF")
-            report_lines.append("")
-            report_lines.append(f"**Found {len(extra_in_tables)} discrepancies**")
-            report_lines.append("")
-            report_lines.append("| Number | PDF Count | Table Count | Difference |")
-            report_lines.append("|--------|-----------|-------------|------------|")
-            for item in extra_in_tables:
-                diff = item['table_count'] - item['pdf_count']
-                report_lines.append(f"| {item['number']:>15} | {item['pdf_count']:>9} | {item['table_count']:>11} | {diff:>10} |")
-            report_lines.append("")
-
-        if not missing_in_tables and not extra_in_tables:
-            report_lines.append("## ✅ Validation Passed")
-            report_lines.append("")
-            report_lines.append("No discrepancies detected! All numbers match.")
-            report_lines.append("")
-        else:
-            report_lines.append("## 📋 Recommendation")
-            report_lines.append("")
-            report_lines.append("Please manually verify the flagged numbers in the Excel output.")
-            report_lines.append("Cross-reference with the source PDF to correct any errors.")
-            report_lines.append("")
-            report_lines.append("### How to Use This Report")
-            report_lines.append("")
-            report_lines.append("1. **Missing in Tables**: These numbers appear in the PDF but are missing or appear fewer times in your extracted tables. Check if they were:")
-            report_lines.append("   - Misread by OCR (e.g., 6 read as 8)")
-            report_lines.append("   - Skipped during extraction")
-            report_lines.append("   - Part of headers or text that shouldn't be in tables")
-            report_lines.append("")
-            report_lines.append("2. **Extra in Tables**: These numbers appear in your tables but don't match the PDF. Check if they are:")
-            report_lines.append("   - OCR errors (incorrect readings)")
-            report_lines.append("   - Duplicates")
-            report_lines.append("   - Numbers from headers mistakenly included")
-            report_lines.append("")
-
-        report_lines.append("---")
-        report_lines.append("")
-        report_lines.append(f"*Report generated automatically by pdf-to-xls-vision*")
-
-        # Write report
+        # Write report section by section: discrepancy tables can run to
+        # thousands of rows, and streaming them as one joined block per
+        # section skips both the per-row list append and the final
+        # whole-document concatenation
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report_lines))
+            f.write(
+                "# Data Validation Report\n"
+                "\n"
+                f"**Source PDF:** `{pdf_path.name}`\n"
+                "\n"
+                "## Summary\n"
+                "\n"
+                "| Metric | Count |\n"
+                "|--------|-------|\n"
+                f"| Total numbers in PDF | {total_pdf_numbers:,} |\n"
+                f"| Total numbers in tables | {total_table_numbers:,} |\n"
+                f"| Matching numbers | {matches:,} |\n"
+                f"| **Accuracy** | **{accuracy:.2f}%** |\n"
+                "\n"
+            )
+
+            if missing_in_tables:
+                f.write(
+                    "## ⚠️ Numbers in PDF but Missing/Undercounted in Tables\n"
+                    "\n"
+                    f"**Found {len(missing_in_tables)} discrepancies**\n"
+                    "\n"
+                    "| Number | PDF Count | Table Count | Difference |\n"
+                    "|--------|-----------|-------------|------------|\n"
+                )
+                f.write('\n'.join(
+                    f"| {item['number']:>15} | {item['pdf_count']:>9} |"
+                    f" {item['table_count']:>11} |"
+                    f" {item['pdf_count'] - item['table_count']:>10} |"
+                    for item in missing_in_tables
+                ))
+                f.write('\n\n')
+
+            if extra_in_tables:
+                f.write(
+                    "## ⚠️ Numbers in Tables but Missing/Undercounted in PDF\n"
+                    "\n"
+                    f"**Found {len(extra_in_tables)} discrepancies**\n"
+                    "\n"
+                    "| Number | PDF Count | Table Count | Difference |\n"
+                    "|--------|-----------|-------------|------------|\n"
+                )
+                f.write('\n'.join(
+                    f"| {item['number']:>15} | {item['pdf_count']:>9} |"
+                    f" {item['table_count']:>11} |"
+                    f" {item['table_count'] - item['pdf_count']:>10} |"
+                    for item in extra_in_tables
+                ))
+                f.write('\n\n')
+
+            if not missing_in_tables and not extra_in_tables:
+                f.write(
+                    "## ✅ Validation Passed\n"
+                    "\n"
+                    "No discrepancies detected! All numbers match.\n"
+                    "\n"
+                )
+            else:
+                f.write(
+                    "## 📋 Recommendation\n"
+                    "\n"
+                    "Please manually verify the flagged numbers in the Excel output.\n"
+                    "Cross-reference with the source PDF to correct any errors.\n"
+                    "\n"
+                    "### How to Use This Report\n"
+                    "\n"
+                    "1. **Missing in Tables**: These numbers appear in the PDF but are missing or appear fewer times in your extracted tables. Check if they were:\n"
+                    "   - Misread by OCR (e.g., 6 read as 8)\n"
+                    "   - Skipped during extraction\n"
+                    "   - Part of headers or text that shouldn't be in tables\n"
+                    "\n"
+                    "2. **Extra in Tables**: These numbers appear in your tables but don't match the PDF. Check if they are:\n"
+                    "   - OCR errors (incorrect readings)\n"
+                    "   - Duplicates\n"
+                    "   - Numbers from headers mistakenly included\n"
+                    "\n"
+                )
+
+            f.write(
+                "---\n"
+                "\n"
+                "*Report generated automatically by pdf-to-xls-vision*"
+            )
 
         print(f"  ✓ Validation report saved: {output_path}")
 
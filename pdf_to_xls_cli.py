@@ -5,9 +5,6 @@ import sys
 import argparse
 from pathlib import Path
 
-from pdf_to_xls import convert_pdf_to_excel, batch_convert_directory
-from pdf_to_xls.config import get_api_key
-
 
 def main():
     """Main CLI entry point."""
@@ -28,6 +25,13 @@ def main():
     )
 
     args = parser.parse_args()
+
+    # Imported after argument parsing: pulling in the package loads pandas,
+    # pdfplumber, and PyMuPDF (~0.5s), which --help and bad-usage exits
+    # should not pay for
+    from pdf_to_xls import convert_pdf_to_excel, batch_convert_directory
+    from pdf_to_xls.config import get_api_key
+
     input_path = Path(args.input)
 
     if not input_path.exists():